@@ -0,0 +1,38 @@
+"""
+Шифр поворачивающейся решетки.
+
+Пакет импортируется без tkinter: графический интерфейс находится в reshetka.gui
+и запускается командой python -m reshetka. Векторизованный и многопроцессный
+шифраторы загружаются при первом обращении, чтобы импорт пакета не тянул NumPy
+и пул процессов.
+"""
+from .alphabet import Alphabet, AlphabetManager
+from .batch import decrypt_many, encrypt_many
+from .binary import ByteGridCipher
+from .container import ContainerReader, ContainerWriter
+from .engine import GridCipher
+from .key import CascadeKey, GridKey, KeyCache, load_key, save_key
+from .metrics import Metrics
+from .stream import decrypt_iter, decrypt_stream, encrypt_iter, encrypt_stream
+
+_LAZY = {
+    'HAS_NUMPY': 'vectorized',
+    'VectorizedByteGridCipher': 'vectorized',
+    'VectorizedGridCipher': 'vectorized',
+    'ParallelGridCipher': 'parallel',
+}
+
+__all__ = [
+    'Alphabet', 'AlphabetManager', 'ByteGridCipher', 'CascadeKey', 'ContainerReader', 'ContainerWriter', 'GridCipher', 'GridKey',
+    'HAS_NUMPY', 'KeyCache', 'Metrics',
+    'ParallelGridCipher', 'VectorizedByteGridCipher', 'VectorizedGridCipher', 'decrypt_iter', 'decrypt_many',
+    'decrypt_stream', 'encrypt_iter', 'encrypt_many', 'encrypt_stream', 'load_key', 'save_key',
+]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        module = importlib.import_module(f'.{_LAZY[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,8 @@
+import sys
+
+if len(sys.argv) > 1:
+    from .cli import main
+    sys.exit(main())
+else:
+    from .gui import main
+    main()
@@ -0,0 +1,200 @@
+import re
+import string
+
+from . import metrics
+
+
+CYRILLIC = 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+LATIN = string.ascii_letters
+FALLBACK = string.digits + string.punctuation
+
+
+def character_range(first, last):
+    """Возвращает строку из всех символов от first до last включительно (например, блок Unicode)."""
+    return ''.join(map(chr, range(ord(first), ord(last) + 1)))
+
+
+def _character_class(characters):
+    """Собирает класс символов регулярного выражения, объединяя подряд идущие коды в диапазоны."""
+    codes = sorted(set(map(ord, characters)))
+    parts = []
+    start = previous = codes[0]
+    for code in codes[1:] + [None]:
+        if code is not None and code == previous + 1:
+            previous = code
+            continue
+        first, last = re.escape(chr(start)), re.escape(chr(previous))
+        parts.append(first if start == previous else f"{first}-{last}")
+        if code is not None:
+            start = previous = code
+    return '[' + ''.join(parts) + ']'
+
+
+class Alphabet:
+    """
+    Алфавит для случайных символов и правило его распознавания в тексте.
+
+    Ведет себя как неизменяемая последовательность символов, поэтому передается шифратору
+    вместо списка. Кортеж символов и регулярное выражение для распознавания строятся один
+    раз при создании, а не при каждом шифровании.
+    """
+    __slots__ = ('name', 'characters', 'symbols', 'detect', '_pattern', '_ascii')
+
+    def __init__(self, name, characters, detect=None):
+        """
+        Параметры:
+        name (str): Имя алфавита, например 'latin'.
+        characters (str): Символы, которыми заполняются свободные ячейки.
+        detect (str): Символы, по наличию которых в тексте выбирается алфавит. По умолчанию -
+            characters; пустая строка - алфавит не распознается, а задается только явно.
+        """
+        if not characters:
+            raise ValueError("An alphabet needs at least one character.")
+        detect = characters if detect is None else detect
+        self.name = name
+        self.characters = characters
+        self.symbols = tuple(characters)
+        self.detect = frozenset(detect)
+        self._pattern = re.compile(_character_class(detect)) if detect else None
+        self._ascii = any(char.isascii() for char in self.detect)
+
+    @classmethod
+    def from_ranges(cls, name, *ranges, detect=None):
+        """
+        Создает алфавит из диапазонов символов, например блоков письменности Unicode.
+
+        Параметры:
+        name (str): Имя алфавита.
+        ranges (tuple): Пары (первый, последний) символ, включительно.
+        detect (str): Символы для распознавания. По умолчанию - все символы диапазонов.
+        """
+        return cls(name, ''.join(character_range(first, last) for first, last in ranges), detect)
+
+    def found_in(self, text):
+        """
+        Проверяет, встречается ли в тексте хотя бы один символ распознавания.
+
+        Поиск идет по заранее скомпилированному классу символов и останавливается на первом
+        совпадении; текст только из ASCII не просматривается вовсе, если среди символов
+        распознавания нет ASCII.
+        """
+        if self._pattern is None or (not self._ascii and text.isascii()):
+            return False
+        return self._pattern.search(text) is not None
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __getitem__(self, index):
+        return self.symbols[index]
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+    def __eq__(self, other):
+        if not isinstance(other, Alphabet):
+            return NotImplemented
+        return (self.name, self.characters, self.detect) == (other.name, other.characters, other.detect)
+
+    def __hash__(self):
+        return hash((self.name, self.characters))
+
+    def __reduce__(self):
+        return Alphabet, (self.name, self.characters, ''.join(sorted(self.detect)))
+
+    def __repr__(self):
+        return f"Alphabet({self.name!r}, {len(self.symbols)} characters)"
+
+
+# Как и прежде, кириллица распознается по буквам А-Я и а-я, латиница - по A-Z и a-z
+CYRILLIC_ALPHABET = Alphabet('cyrillic', CYRILLIC, character_range('А', 'Я') + character_range('а', 'я'))
+LATIN_ALPHABET = Alphabet('latin', LATIN)
+FALLBACK_ALPHABET = Alphabet('fallback', FALLBACK, detect='')
+DIGITS_ALPHABET = Alphabet('digits', string.digits, detect='')
+BYTES_ALPHABET = Alphabet('bytes', character_range('\x00', '\xff'), detect='')  # все значения байта (latin-1)
+
+DEFAULT_ALPHABETS = (CYRILLIC_ALPHABET, LATIN_ALPHABET)
+
+
+class AlphabetManager:
+    """
+    Класс для управления алфавитом и выбора подходящего набора символов (латиница или кириллица).
+
+    Кроме встроенных кириллицы и латиницы можно зарегистрировать собственные алфавиты
+    (register); при распознавании они проверяются в порядке регистрации.
+    """
+    def __init__(self, alphabets=DEFAULT_ALPHABETS, fallback=FALLBACK_ALPHABET):
+        """
+        Инициализация класса. Создание атрибута для хранения алфавита.
+
+        Параметры:
+        alphabets (iterable): Распознаваемые алфавиты в порядке приоритета.
+        fallback (Alphabet): Алфавит для текста, в котором не распознан ни один алфавит.
+        """
+        self.alphabet = None
+        self.alphabets = list(alphabets)
+        self.fallback = fallback
+
+    def register(self, alphabet):
+        """Добавляет алфавит или заменяет зарегистрированный алфавит с тем же именем."""
+        self.alphabets = [known for known in self.alphabets if known.name != alphabet.name] + [alphabet]
+
+    def get(self, name):
+        """Возвращает зарегистрированный алфавит по имени или None."""
+        return next((alphabet for alphabet in self.alphabets if alphabet.name == name), None)
+
+    def candidates(self, text, sample=None):
+        """
+        Возвращает алфавиты, символы которых встречаются в тексте.
+
+        Параметры:
+        text (str): Входной текст для анализа.
+        sample (int): Если задан, анализируются только первые sample символов.
+        """
+        if sample is not None:
+            text = text[:sample]
+        return [alphabet for alphabet in self.alphabets if alphabet.found_in(text)]
+
+    def detect_alphabet(self, text, sample=None):
+        """
+        Определяет тип алфавита в заданном тексте.
+
+        Параметры:
+        text (str): Входной текст для анализа.
+        sample (int): Если задан, анализируются только первые sample символов (для больших текстов).
+
+        Возвращает:
+        str: Тип алфавита (имя алфавита, например 'cyrillic' или 'latin', 'mixed' или 'unknown').
+        """
+        found = self.candidates(text, sample)
+        if len(found) > 1:
+            return 'mixed'
+        elif found:
+            return found[0].name
+        return 'unknown'
+
+    def choose_alphabet(self, text, ask_mixed=None, sample=None):
+        """
+        Выбирает алфавит на основе текста. Если алфавиты смешаны, выбор делает ask_mixed.
+
+        Параметры:
+        text (str): Текст для анализа.
+        ask_mixed (callable): Функция без аргументов, возвращающая имя алфавита, например 'latin'
+            или 'cyrillic' (например, диалог выбора в интерфейсе). Без нее выбирается первый
+            из найденных алфавитов (кириллица для смеси кириллицы и латиницы).
+        sample (int): Если задан, анализируются только первые sample символов.
+        """
+        with metrics.stage('alphabet_detection'):
+            found = self.candidates(text, sample)
+
+        if not found:
+            self.alphabet = self.fallback
+        elif len(found) == 1:
+            self.alphabet = found[0]
+        else:
+            result = ask_mixed() if ask_mixed is not None else None
+            self.alphabet = next((alphabet for alphabet in found if alphabet.name == result), found[0])
+
+    def get_alphabet(self):
+        """Возвращает текущий алфавит."""
+        return self.alphabet
@@ -0,0 +1,378 @@
+"""
+Анализ стойкости ключей: размер пространства ключей и атака по известному открытому тексту.
+
+Пространство ключей считается точно через орбиты решетки (см. reshetka.orbits): каждая
+невырожденная орбита либо пуста, либо содержит ровно одну дырку в одной из четырех ячеек.
+
+Атака восстанавливает дырки по одному блоку открытого текста и шифртекста. Дырки
+перебираются по строкам, в порядке записи первого положения: i-я дырка получает i-й символ
+текста, а ее образ при повороте на 180 градусов - символ с номером 2 * count - 1 - i
+(поворот обходит дырки в обратном порядке). Обе проверки делаются сразу при выборе дырки,
+поэтому почти все ветви отсекаются на первых шагах. Полный ключ проверяется сравнением
+шифртекста, собранного по его порядку записи, с открытым текстом. Ветви с разными первыми
+дырками независимы и распределяются по процессам.
+
+Примеры:
+    python -m reshetka.analysis --rows 8 --cols 8
+    python -m reshetka.analysis --rows 8 12 16 --cols 8 12 16 --trials 5 --workers 8 --output audit.json
+    python -m reshetka.analysis --rows 10 --alphabet ab --blocks 3 --timeout 30
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import random
+import string
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .engine import GridCipher
+from .key import GridKey, compile_write_order
+from .orbits import full_orbit_count, is_degenerate, list_orbits, orbit_count, orbit_index, random_holes
+
+DEFAULT_ALPHABET = string.ascii_lowercase
+DEFAULT_RATE_SECONDS = 0.5
+DEFAULT_BLOCKS = 2
+DEFAULT_TIMEOUT = 60.0
+
+# Событие остановки перебора в рабочем процессе: его выставляет родитель, когда ключ найден
+_stop_event = None
+
+
+def keyspace(rows, cols, holes=None):
+    """
+    Считает размер пространства ключей решетки.
+
+    Параметры:
+    rows (int): Количество строк решетки.
+    cols (int): Количество столбцов решетки.
+    holes (int): Количество дырок в ключе. По умолчанию - максимальное.
+
+    Возвращает:
+    dict: Количество орбит (всех, невырожденных и вырожденных), количество ключей с holes
+        дырками, количество всех допустимых наборов дырок и их двоичные логарифмы.
+    """
+    full = full_orbit_count(rows, cols)
+    holes = full if holes is None else holes
+    if not 0 <= holes <= full:
+        raise ValueError(f"A {rows}x{cols} grid holds at most {full} holes, got {holes}.")
+    keys = math.comb(full, holes) * 4 ** holes
+    configurations = 5 ** full  # каждая орбита: пусто или одна из четырех ячеек
+    return {
+        'rows': rows, 'cols': cols, 'orbits': orbit_count(rows, cols), 'full_orbits': full,
+        'degenerate_orbits': orbit_count(rows, cols) - full, 'holes': holes,
+        'keys': keys, 'keys_log2': math.log2(keys) if keys else 0.0,
+        'configurations': configurations, 'configurations_log2': math.log2(configurations),
+    }
+
+
+def orbit_table(rows, cols):
+    """
+    Перечисляет орбиты решетки для отчета.
+
+    Возвращает:
+    list: Словари с номером орбиты, ее ячейками и признаком вырожденности.
+    """
+    return [{'index': index, 'cells': [list(cell) for cell in orbit],
+             'degenerate': is_degenerate(*orbit[0], rows, cols)}
+            for index, orbit in enumerate(list_orbits(rows, cols))]
+
+
+def _blocks(plaintext, ciphertext, rows, cols, count):
+    """Делит известный текст на пары (блок открытого текста, блок шифртекста)."""
+    size, capacity = rows * cols, 4 * count
+    blocks = len(ciphertext) // size
+    if count < 1 or blocks < 1 or len(ciphertext) != blocks * size or len(plaintext) != blocks * capacity:
+        raise ValueError("Need whole blocks: 4 * count plaintext and rows * cols ciphertext characters per block.")
+    return [(plaintext[block * capacity:(block + 1) * capacity], ciphertext[block * size:(block + 1) * size])
+            for block in range(blocks)]
+
+
+def hole_candidates(blocks, rows, cols, count):
+    """
+    Для каждого номера дырки в порядке записи перечисляет ячейки, совместимые с текстом.
+
+    Ячейка p может быть i-й дыркой, если в каждом известном блоке в ней стоит i-й символ
+    открытого текста, а в ее образе при повороте - символ с номером 2 * count - 1 - i.
+
+    Параметры:
+    blocks (list): Пары (блок открытого текста, блок шифртекста).
+
+    Возвращает:
+    list: Для каждого i - отсортированный кортеж номеров ячеек (row * cols + col).
+    """
+    last = rows * cols - 1
+    usable = [position for position in range(rows * cols)
+              if not is_degenerate(position // cols, position % cols, rows, cols)]
+    return [tuple(position for position in usable
+                  if all(ciphertext[position] == plaintext[index] and
+                         ciphertext[last - position] == plaintext[2 * count - 1 - index]
+                         for plaintext, ciphertext in blocks))
+            for index in range(count)]
+
+
+def _init_worker(event):
+    """Запоминает событие остановки в рабочем процессе."""
+    global _stop_event
+    _stop_event = event
+
+
+def _search_branch(blocks, rows, cols, count, first, candidates, find_all, deadline):
+    """
+    Перебирает ключи, у которых первая (по строкам) дырка - ячейка first.
+
+    Возвращает:
+    tuple: (найденные ключи - списки дырок, количество рассмотренных частичных ключей,
+        количество проверенных полных ключей, закончен ли перебор до deadline).
+    """
+    orbits = [orbit_index(position // cols, position % cols, rows, cols) for position in range(rows * cols)]
+    used = bytearray(orbit_count(rows, cols))
+    holes = [first]
+    found = []
+    nodes = 1
+    leaves = 0
+    timed_out = False
+
+    def matches(order):
+        return all(''.join([ciphertext[position] for position in order]) == plaintext
+                   for plaintext, ciphertext in blocks)
+
+    def descend(index, previous):
+        nonlocal nodes, leaves, timed_out
+        if index == count:
+            leaves += 1
+            pairs = [divmod(position, cols) for position in holes]
+            if matches(compile_write_order(rows, cols, pairs)):
+                found.append(sorted(pairs))
+                return not find_all
+            return False
+        for position in candidates[index]:
+            if position <= previous or used[orbits[position]]:
+                continue
+            nodes += 1
+            if not nodes & 0xFFF:
+                if deadline is not None and time.time() > deadline:
+                    timed_out = True
+                    return True
+                if _stop_event is not None and _stop_event.is_set():
+                    return True
+            used[orbits[position]] = 1
+            holes.append(position)
+            done = descend(index + 1, position)
+            holes.pop()
+            used[orbits[position]] = 0
+            if done:
+                return True
+        return False
+
+    used[orbits[first]] = 1
+    descend(1, first)
+    return found, nodes, leaves, not timed_out
+
+
+def known_plaintext_attack(plaintext, ciphertext, rows, cols, count=None, workers=1, find_all=False, timeout=None):
+    """
+    Восстанавливает дырки ключа по известным блокам открытого текста и шифртекста.
+
+    Одного блока может не хватить, если алфавит мал: тогда тексту соответствуют и другие
+    ключи. Каждый дополнительный блок сужает кандидатов на каждом шаге перебора.
+
+    Параметры:
+    plaintext (str): Открытый текст целых блоков (4 * count символов на блок).
+    ciphertext (str): Соответствующий шифртекст (rows * cols символов на блок).
+    rows (int): Количество строк решетки.
+    cols (int): Количество столбцов решетки.
+    count (int): Количество дырок. По умолчанию - максимальное для решетки.
+    workers (int): Количество процессов; 1 - перебор в текущем процессе.
+    find_all (bool): Искать все подходящие ключи, а не останавливаться на первом.
+    timeout (float): Предельное время перебора в секундах.
+
+    Возвращает:
+    dict: keys (найденные GridKey), nodes (рассмотренные частичные ключи), leaves (проверенные
+        полные ключи), complete (перебор не прерван по времени), seconds, seconds_to_first
+        (время до первого найденного ключа или None) и nodes_per_second.
+    """
+    count = full_orbit_count(rows, cols) if count is None else count
+    blocks = _blocks(plaintext, ciphertext, rows, cols, count)
+
+    start = time.perf_counter()
+    deadline = time.time() + timeout if timeout is not None else None
+    candidates = hole_candidates(blocks, rows, cols, count)
+    branches = [(blocks, rows, cols, count, first, candidates, find_all, deadline) for first in candidates[0]]
+    keys = []
+    nodes = leaves = 0
+    complete = True
+    first_found = None
+    seconds = None
+
+    def collect(result):
+        nonlocal nodes, leaves, complete, first_found
+        found, branch_nodes, branch_leaves, finished = result
+        nodes += branch_nodes
+        leaves += branch_leaves
+        complete = complete and finished
+        if found and first_found is None:
+            first_found = time.perf_counter() - start
+        keys.extend(GridKey(rows, cols, holes) for holes in found)
+
+    def stop():
+        return (keys and not find_all) or not complete
+
+    if workers <= 1 or len(branches) < 2:
+        for branch in branches:
+            collect(_search_branch(*branch))
+            if stop():
+                break
+    else:
+        event = multiprocessing.Event()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(event,)) as executor:
+            pending = {executor.submit(_search_branch, *branch) for branch in branches}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+                if stop():
+                    # Ветви, которые еще выполняются, прерываются по событию, а время
+                    # останавливается сразу: ожидание их завершения к атаке не относится
+                    seconds = time.perf_counter() - start
+                    event.set()
+                    for future in pending:
+                        future.cancel()
+                    break
+
+    if seconds is None:
+        seconds = time.perf_counter() - start
+    return {
+        'keys': keys, 'nodes': nodes, 'leaves': leaves, 'complete': complete, 'seconds': seconds,
+        'seconds_to_first': first_found, 'nodes_per_second': nodes / seconds if seconds > 0 else 0.0,
+    }
+
+
+def exhaustive_rate(rows, cols, count=None, seconds=DEFAULT_RATE_SECONDS, rng=None):
+    """
+    Измеряет, сколько случайных ключей в секунду можно проверить полным перебором
+    (компиляция порядка записи и сравнение блока).
+
+    Возвращает:
+    float: Ключей в секунду.
+    """
+    rng = rng if rng is not None else random.Random(0)
+    holes = [random_holes(rows, cols, count, rng) for _ in range(64)]
+    ciphertext = ''.join(rng.choices(DEFAULT_ALPHABET, k=rows * cols))
+    expected = ciphertext[:4 * len(holes[0])]
+    checked = matches = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for key_holes in holes:
+            order = compile_write_order(rows, cols, key_holes)
+            matches += ''.join([ciphertext[position] for position in order]) == expected
+        checked += len(holes)
+    return checked / (time.perf_counter() - start)
+
+
+def audit(rows, cols, trials=3, workers=1, alphabet=DEFAULT_ALPHABET, blocks=DEFAULT_BLOCKS,
+          timeout=DEFAULT_TIMEOUT, rng=None):
+    """
+    Оценивает стойкость решетки: пространство ключей, скорость полного перебора и атаку
+    по известному открытому тексту на trials случайных ключах.
+
+    Параметры:
+    rows (int): Количество строк решетки.
+    cols (int): Количество столбцов решетки.
+    trials (int): Сколько случайных ключей атаковать.
+    workers (int): Количество процессов для атаки.
+    alphabet (str): Алфавит открытого текста (чем он меньше, тем слабее отсечение).
+    blocks (int): Сколько блоков открытого текста известно атакующему.
+    timeout (float): Предельное время одной атаки в секундах.
+    rng (random.Random): Генератор случайных чисел. По умолчанию - random.Random(0).
+
+    Возвращает:
+    dict: Результаты в виде, пригодном для JSON.
+    """
+    rng = rng if rng is not None else random.Random(0)
+    space = keyspace(rows, cols)
+    rate = exhaustive_rate(rows, cols, rng=rng)
+    attacks = []
+    for _ in range(trials):
+        key = GridKey(rows, cols, random_holes(rows, cols, rng=rng))
+        cipher = GridCipher(key, alphabet, random.Random(rng.getrandbits(32)))
+        plaintext = ''.join(rng.choices(alphabet, k=cipher.max_length * blocks))
+        result = known_plaintext_attack(plaintext, cipher.encrypt(plaintext), rows, cols, workers=workers,
+                                        timeout=timeout)
+        attacks.append({
+            'recovered': key in result['keys'],
+            # Другой ключ с тем же порядком записи расшифровывает так же, как исходный
+            'equivalent': any(found.write_order == key.write_order for found in result['keys']),
+            'candidates': len(result['keys']), 'complete': result['complete'],
+            'nodes': result['nodes'], 'leaves': result['leaves'], 'seconds': result['seconds'],
+            'seconds_to_first': result['seconds_to_first'], 'nodes_per_second': result['nodes_per_second'],
+        })
+    space.update({
+        'exhaustive_keys_per_second': rate,
+        # Порядок величины: точное число ключей может не поместиться в float
+        'exhaustive_seconds_log10': math.log10(space['keys']) - math.log10(rate) if space['keys'] else 0.0,
+        'workers': workers, 'alphabet_size': len(set(alphabet)), 'known_blocks': blocks, 'attacks': attacks,
+    })
+    return space
+
+
+def build_parser():
+    """Создает разборщик аргументов командной строки."""
+    parser = argparse.ArgumentParser(prog='python -m reshetka.analysis',
+                                     description="Key space and known-plaintext attack audit for grid sizes.")
+    parser.add_argument('--rows', type=int, nargs='+', required=True)
+    parser.add_argument('--cols', type=int, nargs='+', help="columns for each --rows value (default: square)")
+    parser.add_argument('--trials', type=int, default=3, help="random keys to attack per grid")
+    parser.add_argument('--workers', type=int, default=1, help="processes for the attack search")
+    parser.add_argument('--alphabet', default=DEFAULT_ALPHABET, help="plaintext alphabet of the attack")
+    parser.add_argument('--blocks', type=int, default=DEFAULT_BLOCKS, help="known plaintext blocks per attack")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="time limit of one attack in seconds")
+    parser.add_argument('--orbits', action='store_true', help="include the list of orbits in the report")
+    parser.add_argument('--output', help="write the report to this JSON file")
+    return parser
+
+
+def main(argv=None):
+    """Точка входа командной строки. Возвращает код завершения."""
+    args = build_parser().parse_args(argv)
+    cols = args.cols if args.cols is not None else args.rows
+    if len(cols) != len(args.rows):
+        print("error: --cols needs one value per --rows value", file=sys.stderr)
+        return 2
+    if args.trials < 0 or args.workers < 1 or args.blocks < 1 or not args.alphabet:
+        print("error: --trials must be non-negative, --workers and --blocks positive, --alphabet non-empty",
+              file=sys.stderr)
+        return 2
+
+    grids = []
+    for rows, columns in zip(args.rows, cols):
+        if full_orbit_count(rows, columns) < 1:
+            print(f"error: a {rows}x{columns} grid has no usable holes", file=sys.stderr)
+            return 2
+        result = audit(rows, columns, args.trials, args.workers, args.alphabet, args.blocks, args.timeout)
+        if args.orbits:
+            result['orbit_list'] = orbit_table(rows, columns)
+        grids.append(result)
+        attacks = result['attacks']
+        recovered = sum(attack['recovered'] for attack in attacks)
+        times = [attack['seconds_to_first'] for attack in attacks if attack['recovered']]
+        mean = sum(times) / len(times) if times else 0.0
+        print(f"{rows}x{columns}: 2^{result['keys_log2']:.1f} keys, "
+              f"exhaustive search ~10^{result['exhaustive_seconds_log10']:.1f} s, "
+              f"known plaintext {recovered}/{len(attacks)} recovered in {mean:.3f} s on average", file=sys.stderr)
+
+    report = {'python': platform.python_version(), 'platform': platform.platform(),
+              'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'grids': grids}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
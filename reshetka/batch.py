@@ -0,0 +1,74 @@
+"""
+Пакетное шифрование множества коротких сообщений несколькими ключами.
+
+Шифратор для ключа создается один раз и хранится в кэше текущего потока (шифратор
+держит буферы заполнения и поэтому не разделяется между потоками). Дальше каждый
+пакет - это один вызов GridCipher.encrypt_many или decrypt_many:
+
+    ciphertexts = encrypt_many(messages, key)
+    messages = decrypt_many(ciphertexts, [len(message) for message in messages], key)
+"""
+import threading
+from collections import OrderedDict
+
+from .engine import GridCipher
+
+DEFAULT_CACHED_CIPHERS = 16
+
+_local = threading.local()
+
+
+def cipher_for(key, cipher_class=GridCipher, maxsize=DEFAULT_CACHED_CIPHERS):
+    """
+    Возвращает шифратор для ключа из кэша текущего потока или создает новый.
+
+    Параметры:
+    key (GridKey): Ключ.
+    cipher_class (type): Класс шифратора (GridCipher или ByteGridCipher).
+    maxsize (int): Сколько шифраторов хранить в кэше потока.
+    """
+    ciphers = _local.__dict__.setdefault('ciphers', OrderedDict())
+    cipher = ciphers.get((key, cipher_class))
+    if cipher is None:
+        cipher = ciphers[(key, cipher_class)] = cipher_class(key)
+        while len(ciphers) > maxsize:
+            ciphers.popitem(last=False)
+    else:
+        ciphers.move_to_end((key, cipher_class))
+    return cipher
+
+
+def _resolve(key):
+    """Возвращает шифратор: переданный или из кэша для ключа."""
+    return key if isinstance(key, GridCipher) else cipher_for(key)
+
+
+def encrypt_many(messages, key, alphabet=None):
+    """
+    Шифрует сообщения одним ключом.
+
+    Параметры:
+    messages (iterable): Открытые тексты.
+    key (GridKey | GridCipher): Ключ или готовый шифратор.
+    alphabet (list): Алфавит для случайных символов. По умолчанию определяется
+        по каждому сообщению.
+
+    Возвращает:
+    list: Шифртексты в порядке сообщений.
+    """
+    return _resolve(key).encrypt_many(messages, alphabet)
+
+
+def decrypt_many(ciphertexts, lengths, key):
+    """
+    Дешифрует шифртексты одним ключом.
+
+    Параметры:
+    ciphertexts (iterable): Шифртексты.
+    lengths (iterable): Длины исходных сообщений.
+    key (GridKey | GridCipher): Ключ или готовый шифратор.
+
+    Возвращает:
+    list: Открытые тексты в порядке шифртекстов.
+    """
+    return _resolve(key).decrypt_many(ciphertexts, lengths)
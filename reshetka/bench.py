@@ -0,0 +1,239 @@
+"""
+Замеры производительности горячих участков шифра с сохранением результатов в JSON
+и сравнением с предыдущим запуском.
+
+Примеры:
+    python -m reshetka.bench --output bench.json
+    python -m reshetka.bench --output new.json --compare bench.json --threshold 0.15
+    python -m reshetka.bench --grids 4 20 256 1024 --sizes 64 1M 256M --backends python numpy parallel
+
+Для каждого замера сохраняется лучшее время из нескольких повторов и пропускная
+способность (символов или операций в секунду). При сравнении замер считается
+регрессией, если пропускная способность упала больше чем на threshold.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from .engine import GridCipher
+from .key import GridKey
+from .orbits import OccupancyMap, random_holes
+
+DEFAULT_GRIDS = (4, 20, 256, 1024)
+DEFAULT_SIZES = ('64', '64K', '4M')
+DEFAULT_BACKENDS = ('python', 'numpy', 'parallel')
+BATCH_MESSAGES = 10000  # Количество коротких сообщений в замере пакетного режима
+BATCH_CELLS = 1 << 22  # Наибольшее суммарное число ячеек блоков в замере пакетного режима
+_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+
+def parse_size(text):
+    """Преобразует размер вида 64, 64K, 4M или 1G в количество символов."""
+    text = text.strip().upper()
+    unit = text[-1] if text[-1] in _UNITS else ''
+    return int(text[:len(text) - len(unit)]) * _UNITS[unit]
+
+
+def best_time(function, repeat, min_time=0.2):
+    """
+    Возвращает лучшее время одного вызова function.
+
+    Параметры:
+    function (callable): Замеряемая функция без аргументов.
+    repeat (int): Количество повторов.
+    min_time (float): Повторы продолжаются, пока суммарное время меньше min_time.
+    """
+    best = float('inf')
+    total = 0.0
+    runs = 0
+    while runs < repeat or (total < min_time and runs < 1000):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+    return best
+
+
+def make_cipher(backend, key, workers):
+    """Создает шифратор для реализации backend или возвращает None, если она недоступна."""
+    alphabet = list('abcdefghijklmnopqrstuvwxyz')
+    if backend == 'python':
+        return GridCipher(key, alphabet, random.Random(0))
+    if backend == 'numpy':
+        from .vectorized import HAS_NUMPY, VectorizedGridCipher
+        return VectorizedGridCipher(key, alphabet, random.Random(0)) if HAS_NUMPY else None
+    if backend == 'parallel':
+        from .parallel import ParallelGridCipher
+        return ParallelGridCipher(key, alphabet, random.Random(0), workers=workers, chunk_blocks=256)
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def bench_key_operations(grid, repeat):
+    """Замеры операций с ключом: генерация, компиляция порядка записи, проверка перекрытий."""
+    rng = random.Random(grid)
+    holes = random_holes(grid, grid, rng=rng)
+    results = [
+        ('key.generate', lambda: random_holes(grid, grid, rng=rng), 1),
+        ('key.compile', lambda: GridKey(grid, grid, holes), 1),
+    ]
+
+    cells = [(rng.randrange(grid), rng.randrange(grid)) for _ in range(4096)]
+
+    def check_overlap():
+        occupancy = OccupancyMap(grid, grid)
+        for row, col in cells:
+            if occupancy.add(row, col):
+                occupancy.remove(row, col)
+
+    results.append(('occupancy.check', check_overlap, len(cells)))
+    for name, function, operations in results:
+        seconds = best_time(function, repeat)
+        yield {'name': name, 'backend': 'python', 'grid': grid, 'size': operations,
+               'seconds': seconds, 'throughput': operations / seconds, 'unit': 'ops/s'}
+
+
+def bench_cipher(backend, key, size, repeat, workers):
+    """Замеры шифрования и дешифрования текста размера size одной реализацией."""
+    cipher = make_cipher(backend, key, workers)
+    if cipher is None:
+        return
+    text = ('lorem ipsum dolor sit amet ' * (size // 27 + 1))[:size]
+    try:
+        ciphertext = cipher.encrypt(text)
+        measurements = (
+            ('encrypt', lambda: cipher.encrypt(text)),
+            ('decrypt', lambda: cipher.decrypt(ciphertext, size)),
+        )
+        for name, function in measurements:
+            seconds = best_time(function, repeat)
+            yield {'name': name, 'backend': backend, 'grid': key.rows, 'size': size,
+                   'seconds': seconds, 'throughput': size / seconds, 'unit': 'chars/s'}
+    finally:
+        if hasattr(cipher, 'close'):
+            cipher.close()
+
+
+def bench_batch(key, repeat, count=None):
+    """
+    Замеры пакетного шифрования и дешифрования count коротких сообщений.
+
+    Каждое сообщение занимает целый блок, поэтому по умолчанию сообщений BATCH_MESSAGES,
+    но не больше, чем помещается в BATCH_CELLS ячеек: на решетке 1024x1024 это 4 сообщения.
+    """
+    if count is None:
+        count = max(1, min(BATCH_MESSAGES, BATCH_CELLS // key.block_size))
+    cipher = make_cipher('python', key, None)
+    messages = [f"message {index:08d} lorem ipsum" for index in range(count)]
+    lengths = [len(message) for message in messages]
+    ciphertexts = cipher.encrypt_many(messages)
+    measurements = (
+        ('encrypt_many', lambda: cipher.encrypt_many(messages)),
+        ('decrypt_many', lambda: cipher.decrypt_many(ciphertexts, lengths)),
+    )
+    for name, function in measurements:
+        seconds = best_time(function, repeat)
+        yield {'name': name, 'backend': 'python', 'grid': key.rows, 'size': count,
+               'seconds': seconds, 'throughput': count / seconds, 'unit': 'msgs/s'}
+
+
+def run(grids, sizes, backends, repeat=3, workers=None, log=None):
+    """
+    Выполняет все замеры.
+
+    Возвращает:
+    dict: Описание окружения и список результатов.
+    """
+    results = []
+
+    def record(result):
+        results.append(result)
+        if log is not None:
+            print(f"{result_id(result):<40} {result['throughput']:>16,.0f} {result['unit']}", file=log)
+
+    for grid in grids:
+        for result in bench_key_operations(grid, repeat):
+            record(result)
+        key = GridKey(grid, grid, random_holes(grid, grid, rng=random.Random(grid)))
+        for size in sizes:
+            for backend in backends:
+                for result in bench_cipher(backend, key, size, repeat, workers):
+                    record(result)
+        if 'python' in backends:
+            for result in bench_batch(key, repeat):
+                record(result)
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+def result_id(result):
+    """Возвращает строку, однозначно определяющую замер для сравнения между запусками."""
+    return f"{result['name']}[{result['backend']},{result['grid']}x{result['grid']},{result['size']}]"
+
+
+def compare(baseline, current, threshold):
+    """
+    Сравнивает результаты с базовыми.
+
+    Параметры:
+    baseline (dict): Результаты предыдущего запуска.
+    current (dict): Результаты текущего запуска.
+    threshold (float): Допустимое относительное падение пропускной способности.
+
+    Возвращает:
+    list: Строки с описанием регрессий.
+    """
+    previous = {result_id(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get(result_id(result))
+        if old is None:
+            continue
+        ratio = result['throughput'] / old['throughput']
+        if ratio < 1 - threshold:
+            regressions.append(f"{result_id(result)}: {old['throughput']:,.0f} -> "
+                               f"{result['throughput']:,.0f} {result['unit']} ({ratio - 1:+.1%})")
+    return regressions
+
+
+def main(argv=None):
+    """Точка входа. Возвращает 1, если найдены регрессии."""
+    parser = argparse.ArgumentParser(prog='python -m reshetka.bench', description="Grid cipher benchmarks.")
+    parser.add_argument('--grids', type=int, nargs='+', default=list(DEFAULT_GRIDS), help="square grid sizes")
+    parser.add_argument('--sizes', nargs='+', default=list(DEFAULT_SIZES), help="message sizes, e.g. 64 64K 4M")
+    parser.add_argument('--backends', nargs='+', choices=DEFAULT_BACKENDS, default=list(DEFAULT_BACKENDS))
+    parser.add_argument('--repeat', type=int, default=3, help="repetitions per measurement (best is kept)")
+    parser.add_argument('--workers', type=int, help="processes for the parallel backend")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--compare', help="baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="allowed relative throughput drop")
+    args = parser.parse_args(argv)
+
+    current = run(args.grids, [parse_size(size) for size in args.sizes], args.backends, args.repeat,
+                  args.workers, log=sys.stdout)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(current, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, current, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Байтовый режим шифра: открытый текст и шифртекст - последовательности байтов.
+
+Принимает bytes, bytearray, memoryview и mmap без преобразования в строку. Блоки
+переставляются прямо в заранее выделенный выходной буфер, поэтому на каждый байт
+не создается отдельный объект, а большие файлы можно шифровать через mmap целиком,
+не читая их в память.
+"""
+import mmap
+from operator import itemgetter
+
+from . import metrics
+from .alphabet import BYTES_ALPHABET
+from .engine import GridCipher
+
+
+def _byte_gatherer(positions):
+    """Возвращает функцию, собирающую байты буфера по списку позиций в объект bytes."""
+    getter = itemgetter(*positions)
+    if len(positions) == 1:
+        return lambda data: bytes((getter(data),))
+    return lambda data: bytes(getter(data))
+
+
+def as_byte_alphabet(alphabet):
+    """
+    Преобразует алфавит в байты для заполнения.
+
+    Параметры:
+    alphabet (bytes | Alphabet | str): Байтовый алфавит или алфавит из символов U+0000-U+00FF,
+        каждый из которых означает байт с тем же кодом.
+
+    Возвращает:
+    bytes: Значения байтов алфавита.
+    """
+    if isinstance(alphabet, (bytes, bytearray, memoryview)):
+        values = bytes(alphabet)
+    else:
+        try:
+            values = ''.join(alphabet).encode('latin-1')
+        except UnicodeEncodeError:
+            raise ValueError("A byte alphabet may only contain characters U+0000-U+00FF.") from None
+    if not values:
+        raise ValueError("An alphabet needs at least one character.")
+    return values
+
+
+def _as_view(data):
+    """Возвращает байтовое представление буфера без копирования."""
+    view = memoryview(data)
+    return view if view.format == 'B' and view.ndim == 1 else view.cast('B')
+
+
+class ByteGridCipher(GridCipher):
+    """
+    Шифр поворачивающейся решетки над байтами.
+
+    Перестановка та же, что у GridCipher: байт открытого текста занимает ячейку, в которую
+    GridCipher записал бы символ с тем же номером. Свободные ячейки заполняются байтами
+    алфавита (по умолчанию - любыми значениями 0-255).
+    """
+    _make_gatherer = staticmethod(_byte_gatherer)
+    _empty = b''
+
+    def __init__(self, key, alphabet=None, rng=None):
+        """
+        Параметры:
+        key (GridKey): Ключ - размеры решетки и набор дырок.
+        alphabet (bytes | Alphabet): Байты для заполнения. По умолчанию - все 256 значений.
+        rng (random.Random): Генератор случайных байтов для заполнения. По умолчанию - os.urandom.
+        """
+        super().__init__(key, alphabet if alphabet is not None else BYTES_ALPHABET, rng)
+        self.byte_alphabet = as_byte_alphabet(self.alphabet)
+        self._read_bytes = _byte_gatherer(self.write_order) if self.write_order else None
+        self._write_bytes = _byte_gatherer(key.cell_sources) if self.write_order else None
+
+    def padding_bytes(self, count, alphabet=None):
+        """Возвращает count случайных байтов алфавита одним срезом из буфера заполнения."""
+        alphabet = self.byte_alphabet if alphabet is None else as_byte_alphabet(alphabet)
+        return self.padding_source(alphabet).take(count)
+
+    def _batch_padding(self, alphabet):
+        """Возвращает источник байтов заполнения для пакетного шифрования (encrypt_many)."""
+        if alphabet is self.alphabet:
+            return self.padding_source(self.byte_alphabet)
+        return self.padding_source(as_byte_alphabet(alphabet))
+
+    def encrypted_size(self, length):
+        """Размер шифртекста для открытого текста длиной length байтов."""
+        return -(-length // self.max_length) * self.block_size
+
+    def encrypt_block(self, substring, alphabet=None):
+        """
+        Шифрует не более max_length байтов и возвращает блок шифртекста.
+
+        Параметры:
+        substring (bytes-like): Байты для шифрования.
+        alphabet (bytes | Alphabet): Байты для заполнения. По умолчанию - алфавит шифратора.
+
+        Возвращает:
+        bytes: Блок длиной rows * cols.
+        """
+        view = _as_view(substring)[:self.max_length]
+        # Недостающие байты текста заполняются так же, как свободные ячейки: дешифрование
+        # их все равно отбросит, а блок собирается одной выборкой по cell_sources.
+        scratch = bytes(view) + self.padding_bytes(self.block_size - len(view), alphabet)
+        return self._write_bytes(scratch)
+
+    def decrypt_block(self, substring, length):
+        """
+        Извлекает из блока шифртекста первые length байтов открытого текста.
+
+        Возвращает:
+        bytes: Расшифрованные байты.
+        """
+        view = _as_view(substring)
+        if len(view) == self.block_size:
+            plain = self._read_bytes(view)
+            return plain if length >= self.max_length else plain[:length]
+        size = len(view)
+        return bytes([view[position] for position in self.write_order if position < size][:length])
+
+    def decrypt_range(self, ciphertext, start, end):
+        """
+        Дешифрует только байты открытого текста с номерами от start до end (не включительно).
+
+        Возвращает:
+        bytes: Байты открытого текста start..end-1 (меньше, если шифртекст короче).
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        source = _as_view(ciphertext)
+        parts = []
+        for block, positions in self.range_cells(start, end):
+            cells = source[block * self.block_size:(block + 1) * self.block_size]
+            if not cells:
+                break
+            if len(positions) == self.max_length and len(cells) == self.block_size:
+                parts.append(self._read_bytes(cells))
+            else:
+                parts.append(bytes([cells[position] for position in positions if position < len(cells)]))
+        return b''.join(parts)
+
+    def encrypt_into(self, data, out, alphabet=None):
+        """
+        Шифрует байты в заранее выделенный буфер.
+
+        Параметры:
+        data (bytes-like): Открытый текст (bytes, bytearray, memoryview, mmap).
+        out (bytes-like): Изменяемый буфер длиной не меньше encrypted_size(len(data)).
+        alphabet (bytes | Alphabet): Байты для заполнения. По умолчанию - алфавит шифратора.
+
+        Возвращает:
+        int: Количество записанных байтов.
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        source = _as_view(data)
+        target = _as_view(out)
+        length = len(source)
+        size = self.encrypted_size(length)
+        if len(target) < size:
+            raise ValueError(f"Output buffer too small: need {size} bytes, got {len(target)}.")
+
+        capacity, block_size = self.max_length, self.block_size
+        free = block_size - capacity
+        full_blocks = length // capacity
+        padding = self.padding_bytes(size - length, alphabet)  # все заполнение одним вызовом
+        scratch = bytearray(block_size)
+        write = self._write_bytes
+        with metrics.stage('permutation'):
+            for block in range(full_blocks):
+                scratch[:capacity] = source[block * capacity:(block + 1) * capacity]
+                scratch[capacity:] = padding[block * free:(block + 1) * free]
+                target[block * block_size:(block + 1) * block_size] = write(scratch)
+            rest = length - full_blocks * capacity
+            if rest:
+                scratch[:rest] = source[full_blocks * capacity:]
+                scratch[rest:] = padding[full_blocks * free:]
+                target[full_blocks * block_size:size] = write(scratch)
+        metrics.count('blocks', size // block_size)
+        metrics.count('bytes', length)
+        return size
+
+    def decrypt_into(self, data, length, out):
+        """
+        Дешифрует байты в заранее выделенный буфер.
+
+        Параметры:
+        data (bytes-like): Шифртекст.
+        length (int): Длина исходного сообщения.
+        out (bytes-like): Изменяемый буфер длиной не меньше length.
+
+        Возвращает:
+        int: Количество записанных байтов (меньше length, если шифртекст короче).
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        source = _as_view(data)
+        target = _as_view(out)
+        if len(target) < length:
+            raise ValueError(f"Output buffer too small: need {length} bytes, got {len(target)}.")
+
+        capacity, block_size = self.max_length, self.block_size
+        full_blocks = min(length // capacity, len(source) // block_size)
+        read = self._read_bytes
+        with metrics.stage('permutation'):
+            for block in range(full_blocks):
+                target[block * capacity:(block + 1) * capacity] = read(
+                    source[block * block_size:(block + 1) * block_size])
+            written = full_blocks * capacity
+            tail = source[full_blocks * block_size:(full_blocks + 1) * block_size]
+            if written < length and tail:
+                plain = self.decrypt_block(tail, length - written)
+                target[written:written + len(plain)] = plain
+                written += len(plain)
+                full_blocks += 1
+        metrics.count('blocks', full_blocks)
+        metrics.count('bytes', written)
+        return written
+
+    def encrypt(self, data, alphabet=None):
+        """
+        Шифрует байты целиком.
+
+        Возвращает:
+        bytearray: Шифртекст длиной, кратной rows * cols.
+        """
+        out = bytearray(self.encrypted_size(len(_as_view(data))))
+        self.encrypt_into(data, out, alphabet)
+        return out
+
+    def decrypt(self, ciphertext, length):
+        """
+        Дешифрует байты.
+
+        Возвращает:
+        bytearray: Открытый текст длиной не более length.
+        """
+        out = bytearray(length)
+        written = self.decrypt_into(ciphertext, length, out)
+        del out[written:]
+        return out
+
+
+def encrypt_file(cipher, source_path, target_path, alphabet=None):
+    """
+    Шифрует файл через mmap: вход и выход отображаются в память, без чтения в буферы Python.
+
+    Параметры:
+    cipher (ByteGridCipher): Байтовый шифратор.
+    source_path (str): Файл открытого текста.
+    target_path (str): Файл шифртекста (перезаписывается).
+
+    Возвращает:
+    int: Длина открытого текста - она нужна для дешифрования.
+    """
+    with open(source_path, 'rb') as source, open(target_path, 'w+b') as target:
+        length = source.seek(0, 2)
+        size = cipher.encrypted_size(length)
+        if not size:
+            return 0
+        target.truncate(size)
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data, \
+                mmap.mmap(target.fileno(), size) as out:
+            cipher.encrypt_into(data, out, alphabet)
+    return length
+
+
+def decrypt_file(cipher, source_path, target_path, length):
+    """
+    Дешифрует файл через mmap.
+
+    Параметры:
+    cipher (ByteGridCipher): Байтовый шифратор.
+    source_path (str): Файл шифртекста.
+    target_path (str): Файл открытого текста (перезаписывается).
+    length (int): Длина исходного сообщения.
+
+    Возвращает:
+    int: Количество записанных байтов.
+    """
+    with open(source_path, 'rb') as source, open(target_path, 'w+b') as target:
+        if not length or not source.seek(0, 2):
+            return 0
+        target.truncate(length)
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data, \
+                mmap.mmap(target.fileno(), length) as out:
+            written = cipher.decrypt_into(data, length, out)
+        if written < length:
+            target.truncate(written)
+    return written
@@ -0,0 +1,362 @@
+"""
+Командная строка для пакетного шифрования и дешифрования файлов и каталогов.
+
+Примеры:
+    python -m reshetka encrypt --key key.json --in docs/ --out encrypted/ --jobs 8
+    python -m reshetka decrypt --key key.json --in encrypted/ --out docs/
+    python -m reshetka encrypt --key key.json < message.txt > message.txt.rgc
+    python -m reshetka encrypt --key key.json --in archive.txt --format container
+    python -m reshetka keygen --rows 20 --cols 20 --out key.json
+    python -m reshetka encrypt --key key.json --in big.txt --metrics metrics.json --profile
+    python -m reshetka encrypt --key round1.json round2.json round3.json --in message.txt
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import metrics
+from .container import CONTAINER_MAGIC, ContainerReader, ContainerWriter
+from .engine import GridCipher
+from .key import CascadeKey, GridKey, load_key, save_key
+from .stream import DEFAULT_CHUNK_BLOCKS, decrypt_stream, encrypt_stream
+
+SUFFIX = '.rgc'
+
+# Шифратор рабочего процесса при обработке каталогов
+_worker_cipher = None
+
+
+def make_cipher(key, backend='auto', jobs=1, chunk_blocks=DEFAULT_CHUNK_BLOCKS):
+    """
+    Создает шифратор с выбранной реализацией.
+
+    Параметры:
+    key (GridKey): Ключ.
+    backend (str): 'python', 'numpy' или 'auto' (NumPy, если установлен).
+    jobs (int): Количество процессов; больше одного - ParallelGridCipher.
+    chunk_blocks (int): Размер части в блоках для многопроцессного режима.
+    """
+    cipher_class = GridCipher
+    if backend in ('auto', 'numpy'):
+        from .vectorized import HAS_NUMPY, VectorizedGridCipher
+        if HAS_NUMPY:
+            cipher_class = VectorizedGridCipher
+        elif backend == 'numpy':
+            raise ValueError("The numpy backend requires numpy to be installed.")
+    if jobs > 1:
+        from .parallel import ParallelGridCipher
+        return ParallelGridCipher(key, workers=jobs, chunk_blocks=chunk_blocks, cipher_class=cipher_class)
+    return cipher_class(key)
+
+
+def stream_chunk_blocks(cipher, chunk_blocks):
+    """
+    Возвращает, сколько блоков читать из потока за раз.
+
+    ParallelGridCipher отдает в процессы части по chunk_blocks блоков и работает в одном
+    процессе, пока частей меньше двух, поэтому ему поток передает по части на каждый процесс.
+    """
+    from .parallel import ParallelGridCipher
+    if isinstance(cipher, ParallelGridCipher) and cipher.workers > 1:
+        return cipher.chunk_blocks * cipher.workers
+    return chunk_blocks
+
+
+def output_path(mode, path):
+    """Возвращает имя выходного файла: при шифровании добавляет .rgc, при дешифровании убирает."""
+    if mode == 'encrypt':
+        return path + SUFFIX
+    if path.endswith(SUFFIX):
+        return path[:-len(SUFFIX)]
+    return path + '.txt'
+
+
+def collect_files(mode, source, target):
+    """
+    Составляет список пар (входной файл, выходной файл) для файла или дерева каталогов.
+
+    Параметры:
+    mode (str): 'encrypt' или 'decrypt'.
+    source (str): Входной файл или каталог.
+    target (str): Выходной файл или каталог.
+    """
+    if not os.path.isdir(source):
+        if target is None or os.path.isdir(target):
+            name = output_path(mode, os.path.basename(source))
+            target = os.path.join(target if target is not None else os.path.dirname(source), name)
+        return [(source, target)]
+
+    if target is None:
+        raise ValueError("--out is required when --in is a directory.")
+    pairs = []
+    for directory, _, names in os.walk(source):
+        for name in sorted(names):
+            if mode == 'decrypt' and not name.endswith(SUFFIX):
+                continue
+            relative = os.path.relpath(os.path.join(directory, name), source)
+            pairs.append((os.path.join(source, relative), os.path.join(target, output_path(mode, relative))))
+    return pairs
+
+
+def is_container(path):
+    """Проверяет, является ли файл двоичным контейнером (а не потоком RGC1)."""
+    with open(path, 'rb') as file:
+        return file.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+
+
+def process_file(cipher, mode, source, target, encoding, chunk_blocks, container=False):
+    """
+    Шифрует или дешифрует один файл потоково.
+
+    Параметры:
+    container (bool): Шифровать в двоичный контейнер вместо потока RGC1. При дешифровании
+        формат определяется по содержимому файла.
+
+    Возвращает:
+    tuple: (прочитано байт, записано байт).
+    """
+    directory = os.path.dirname(target)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    chunk_blocks = stream_chunk_blocks(cipher, chunk_blocks)
+    if mode == 'encrypt' and container:
+        with open(source, encoding=encoding, newline='') as reader, open(target, 'wb') as file:
+            writer = ContainerWriter(cipher, file)
+            while True:
+                chunk = reader.read(cipher.max_length * chunk_blocks)
+                if not chunk:
+                    break
+                writer.write(chunk)
+            writer.close()
+        return os.path.getsize(source), os.path.getsize(target)
+    if mode == 'decrypt' and is_container(source):
+        with open(source, 'rb') as file, open(target, 'w', encoding=encoding, newline='') as writer:
+            for part in ContainerReader(file, cipher.key).iter_decrypt(cipher, chunk_blocks):
+                writer.write(part)
+        return os.path.getsize(source), os.path.getsize(target)
+
+    # newline='' сохраняет переводы строк без изменений
+    with open(source, encoding=encoding, newline='') as reader, \
+            open(target, 'w', encoding=encoding, newline='') as writer:
+        if mode == 'encrypt':
+            encrypt_stream(cipher, reader, writer, chunk_blocks)
+        else:
+            decrypt_stream(cipher, reader, writer, chunk_blocks)
+    return os.path.getsize(source), os.path.getsize(target)
+
+
+def _init_worker(key, backend):
+    """Создает шифратор в рабочем процессе."""
+    global _worker_cipher
+    _worker_cipher = make_cipher(key, backend)
+
+
+def _process_in_worker(mode, source, target, encoding, chunk_blocks, container):
+    """Обрабатывает файл в рабочем процессе и возвращает результат или ошибку."""
+    try:
+        return source, process_file(_worker_cipher, mode, source, target, encoding, chunk_blocks, container), None
+    except (OSError, ValueError, UnicodeError) as error:
+        return source, None, str(error)
+
+
+def run_files(mode, key, pairs, args):
+    """Обрабатывает список файлов, при --jobs > 1 - в пуле процессов."""
+    if args.jobs > 1 and len(pairs) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                                 initargs=(key, args.backend)) as executor:
+            futures = [executor.submit(_process_in_worker, mode, source, target, args.encoding, args.chunk_blocks,
+                                       args.format == 'container')
+                       for source, target in pairs]
+            for future in futures:
+                yield future.result()
+        return
+
+    cipher = make_cipher(key, args.backend, args.jobs, args.chunk_blocks)
+    try:
+        for source, target in pairs:
+            try:
+                yield source, process_file(cipher, mode, source, target, args.encoding, args.chunk_blocks,
+                                           args.format == 'container'), None
+            except (OSError, ValueError, UnicodeError) as error:
+                yield source, None, str(error)
+    finally:
+        if hasattr(cipher, 'close'):
+            cipher.close()
+
+
+class _CountingReader:
+    """Обертка над текстовым файлом, считающая прочитанные символы."""
+    def __init__(self, file):
+        self.file = file
+        self.count = 0
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.count += len(data)
+        return data
+
+
+def run_stdio(mode, key, args):
+    """
+    Обрабатывает стандартный ввод и записывает результат в стандартный вывод.
+
+    Возвращает:
+    tuple: (прочитано символов, записано символов).
+    """
+    cipher = make_cipher(key, args.backend, args.jobs, args.chunk_blocks)
+    chunk_blocks = stream_chunk_blocks(cipher, args.chunk_blocks)
+    reader = open(sys.stdin.fileno(), encoding=args.encoding, newline='', closefd=False)
+    writer = open(sys.stdout.fileno(), 'w', encoding=args.encoding, newline='', closefd=False)
+    try:
+        with reader, writer:
+            counter = _CountingReader(reader)
+            if mode == 'encrypt':
+                written = encrypt_stream(cipher, counter, writer, chunk_blocks)
+            else:
+                written = decrypt_stream(cipher, counter, writer, chunk_blocks)
+        return counter.count, written
+    finally:
+        if hasattr(cipher, 'close'):
+            cipher.close()
+
+
+def format_stats(files, failed, bytes_in, bytes_out, elapsed, unit='MB'):
+    """
+    Возвращает строку со статистикой обработки.
+
+    Параметры:
+    unit (str): Название миллиона единиц объема: 'MB' для файлов, 'M chars' для стандартного ввода.
+    """
+    megabytes = bytes_in / 1e6
+    throughput = megabytes / elapsed if elapsed > 0 else 0.0
+    return (f"{files} file(s), {failed} failed, {megabytes:.2f} {unit} in, {bytes_out / 1e6:.2f} {unit} out, "
+            f"{elapsed:.2f} s, {throughput:.2f} {unit}/s")
+
+
+def build_parser():
+    """Создает разборщик аргументов командной строки."""
+    parser = argparse.ArgumentParser(prog='python -m reshetka',
+                                     description="Turning grid cipher: batch encryption and decryption.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for command in ('encrypt', 'decrypt'):
+        sub = commands.add_parser(command, help=f"{command} a file, a directory tree or stdin")
+        sub.add_argument('--key', required=True, nargs='+',
+                         help="key file; several keys are applied in order as one fused cascade")
+        sub.add_argument('--in', dest='source', default='-', help="input file or directory ('-' for stdin)")
+        sub.add_argument('--out', dest='target', help="output file or directory (stdout when reading stdin)")
+        sub.add_argument('--jobs', type=int, default=1, help="number of worker processes")
+        sub.add_argument('--backend', choices=('auto', 'python', 'numpy'), default='auto')
+        sub.add_argument('--chunk-blocks', type=int, default=DEFAULT_CHUNK_BLOCKS,
+                         help="blocks processed per chunk")
+        sub.add_argument('--encoding', default='utf-8', help="text encoding of plaintext files")
+        sub.add_argument('--quiet', action='store_true', help="do not print statistics")
+        sub.add_argument('--metrics', metavar='PATH',
+                         help="write per-stage timers and counters as JSON ('-' for stderr)")
+        sub.add_argument('--profile', action='store_true',
+                         help="add a cProfile summary and tracemalloc peak to --metrics")
+        if command == 'encrypt':
+            sub.add_argument('--format', choices=('stream', 'container'), default='stream',
+                             help="output format; container needs a file output (decrypt detects it)")
+        else:
+            sub.set_defaults(format='stream')
+
+    keygen = commands.add_parser('keygen', help="generate a random key with the maximum number of holes")
+    keygen.add_argument('--rows', type=int, required=True)
+    keygen.add_argument('--cols', type=int, required=True)
+    keygen.add_argument('--holes', type=int, help="number of holes (default: maximum)")
+    keygen.add_argument('--out', dest='target', required=True, help="key file (.rgk for the binary format)")
+    return parser
+
+
+def run_keygen(args):
+    """Генерирует ключ и сохраняет его в файл."""
+    try:
+        key = GridKey.random(args.rows, args.cols, args.holes)
+        save_key(key, args.target)
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    print(f"{args.rows}x{args.cols} key with {len(key.holes)} holes written to {args.target}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    """Точка входа командной строки. Возвращает код завершения."""
+    args = build_parser().parse_args(argv)
+    if args.command == 'keygen':
+        return run_keygen(args)
+    if args.jobs < 1 or args.chunk_blocks < 1:
+        print("error: --jobs and --chunk-blocks must be positive", file=sys.stderr)
+        return 2
+
+    if args.profile and not args.metrics:
+        print("error: --profile requires --metrics", file=sys.stderr)
+        return 2
+
+    recorder = metrics.Metrics(profile=args.profile, trace_memory=args.profile) if args.metrics else None
+    with recorder if recorder is not None else contextlib.nullcontext():
+        code = run_command(args)
+    if recorder is not None:
+        try:
+            if args.metrics == '-':
+                print(recorder.to_json(), file=sys.stderr)
+            else:
+                recorder.save(args.metrics)
+        except OSError as error:
+            print(f"error: cannot write metrics {args.metrics}: {error}", file=sys.stderr)
+            return code or 1
+    return code
+
+
+def run_command(args):
+    """Выполняет шифрование или дешифрование по аргументам командной строки. Возвращает код завершения."""
+    keys = []
+    for path in args.key:
+        try:
+            keys.append(load_key(path))
+        except (OSError, ValueError) as error:
+            print(f"error: cannot load key {path}: {error}", file=sys.stderr)
+            return 2
+    try:
+        key = keys[0] if len(keys) == 1 else CascadeKey(keys)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        if args.source == '-':
+            if args.format == 'container':
+                raise ValueError("--format container cannot be used with stdin/stdout.")
+            chars_in, chars_out = run_stdio(args.command, key, args)
+            metrics.count('characters_in', chars_in)
+            metrics.count('characters_out', chars_out)
+            if not args.quiet:
+                # Статистика идет в stderr, чтобы не смешиваться с результатом в stdout
+                print(format_stats(1, 0, chars_in, chars_out, time.perf_counter() - start, 'M chars'),
+                      file=sys.stderr)
+            return 0
+        pairs = collect_files(args.command, args.source, args.target)
+    except (OSError, ValueError, UnicodeError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    files = failed = bytes_in = bytes_out = 0
+    for source, result, error in run_files(args.command, key, pairs, args):
+        files += 1
+        if error is not None:
+            failed += 1
+            print(f"error: {source}: {error}", file=sys.stderr)
+            continue
+        bytes_in += result[0]
+        bytes_out += result[1]
+        metrics.count('files')
+        metrics.count('bytes_in', result[0])
+        metrics.count('bytes_out', result[1])
+
+    if not args.quiet:
+        print(format_stats(files, failed, bytes_in, bytes_out, time.perf_counter() - start), file=sys.stderr)
+    return 1 if failed else 0
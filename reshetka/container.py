@@ -0,0 +1,391 @@
+"""
+Самоописывающий контейнер шифртекста.
+
+В отличие от потока RGC1, где длина открытого текста записана в конце, контейнер
+начинается с заголовка со всеми сведениями, нужными для дешифрования, и может хранить
+смещения блоков. Поэтому дешифровать его можно без исходного текста, а блок с номером N
+читается сразу, без обработки предыдущих.
+
+Двоичный формат (числа little-endian):
+
+    b'RGC2'              - сигнатура
+    version (uint8)      - версия формата (1)
+    flags (uint8)        - 1: есть таблица смещений блоков; 2: блоки - байты (ByteGridCipher)
+    rows, cols (uint32)  - размеры решетки
+    digest (32 байта)    - SHA-256 ключа (GridKey.digest)
+    length (uint64)      - длина открытого текста в символах (байтах)
+    blocks (uint64)      - количество блоков
+    index (uint64)       - смещение таблицы смещений от начала контейнера или 0
+    <блоки>              - текстовые блоки в UTF-8 или байтовые блоки по rows * cols байтов
+    <таблица смещений>   - blocks + 1 чисел uint64: начало каждого блока и конец последнего
+                           относительно начала блоков
+
+Текстовая форма (для окна программы и буфера обмена) - строка заголовка и блоки:
+
+    RGC2 <version> <rows> <cols> <digest> <length> <blocks>\\n<блок>...<блок>
+"""
+import codecs
+import struct
+import sys
+from array import array
+
+from .binary import ByteGridCipher
+from .stream import DEFAULT_CHUNK_BLOCKS
+
+CONTAINER_MAGIC = b'RGC2'
+CONTAINER_VERSION = 1
+FLAG_OFFSETS = 1
+FLAG_BYTES = 2
+_HEADER = struct.Struct('<4sBBII32sQQQ')
+_OFFSET = struct.Struct('<Q')
+_ENCODING = 'utf-8'
+
+
+def _offsets_to_bytes(values):
+    """Преобразует массив смещений в little-endian байты."""
+    if sys.byteorder == 'big':
+        values = array('Q', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _offsets_from_bytes(data):
+    """Читает массив смещений из little-endian байтов."""
+    values = array('Q', data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class ContainerHeader:
+    """
+    Заголовок контейнера: все, что нужно для дешифрования, кроме самого ключа.
+    """
+    __slots__ = ('rows', 'cols', 'digest', 'length', 'block_count', 'flags', 'index')
+
+    def __init__(self, rows, cols, digest, length, block_count, flags=0, index=0):
+        """
+        Параметры:
+        rows (int): Количество строк решетки.
+        cols (int): Количество столбцов решетки.
+        digest (str): SHA-256 ключа в шестнадцатеричном виде.
+        length (int): Длина открытого текста.
+        block_count (int): Количество блоков.
+        flags (int): FLAG_OFFSETS и FLAG_BYTES.
+        index (int): Смещение таблицы смещений от начала контейнера (0, если ее нет).
+        """
+        self.rows = rows
+        self.cols = cols
+        self.digest = digest
+        self.length = length
+        self.block_count = block_count
+        self.flags = flags
+        self.index = index
+
+    @classmethod
+    def for_key(cls, key, length, block_count, flags=0):
+        """Создает заголовок для ключа."""
+        return cls(key.rows, key.cols, key.digest(), length, block_count, flags)
+
+    def check_key(self, key):
+        """Проверяет, что контейнер зашифрован этим ключом."""
+        if (self.rows, self.cols) != (key.rows, key.cols):
+            raise ValueError(f"Container was encrypted with a {self.rows}x{self.cols} grid, "
+                             f"but the key is {key.rows}x{key.cols}.")
+        if self.digest != key.digest():
+            raise ValueError("Container was encrypted with a different key.")
+
+    def to_bytes(self):
+        """Возвращает двоичный заголовок."""
+        return _HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, self.flags, self.rows, self.cols,
+                            bytes.fromhex(self.digest), self.length, self.block_count, self.index)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Разбирает двоичный заголовок."""
+        if len(data) < _HEADER.size:
+            raise ValueError("Invalid container: truncated header.")
+        magic, version, flags, rows, cols, digest, length, block_count, index = _HEADER.unpack_from(data)
+        if magic != CONTAINER_MAGIC:
+            raise ValueError("Not a grid cipher container: bad magic.")
+        if version != CONTAINER_VERSION:
+            raise ValueError(f"Unsupported container version: {version}.")
+        return cls(rows, cols, digest.hex(), length, block_count, flags, index)
+
+    def to_text(self):
+        """Возвращает строку заголовка текстовой формы."""
+        return (f"{CONTAINER_MAGIC.decode()} {CONTAINER_VERSION} {self.rows} {self.cols} {self.digest} "
+                f"{self.length} {self.block_count}\n")
+
+    @classmethod
+    def from_text(cls, line):
+        """Разбирает строку заголовка текстовой формы."""
+        parts = line.split()
+        if len(parts) != 7 or parts[0] != CONTAINER_MAGIC.decode():
+            raise ValueError("Not a grid cipher container: bad header.")
+        if parts[1] != str(CONTAINER_VERSION):
+            raise ValueError(f"Unsupported container version: {parts[1]}.")
+        try:
+            rows, cols, length, block_count = (int(part) for part in (parts[2], parts[3], parts[5], parts[6]))
+            bytes.fromhex(parts[4])
+        except ValueError:
+            raise ValueError("Not a grid cipher container: bad header.") from None
+        return cls(rows, cols, parts[4], length, block_count)
+
+
+def pack_text(cipher, text, alphabet=None):
+    """
+    Шифрует текст и возвращает текстовую форму контейнера.
+
+    Параметры:
+    cipher (GridCipher): Шифратор.
+    text (str): Открытый текст.
+    alphabet (list): Алфавит для случайных символов.
+    """
+    ciphertext = cipher.encrypt(text, alphabet)
+    header = ContainerHeader.for_key(cipher.key, len(text), len(ciphertext) // cipher.block_size)
+    return header.to_text() + ciphertext
+
+
+def is_text_container(text):
+    """Проверяет, начинается ли текст с заголовка текстовой формы контейнера."""
+    return text.startswith(CONTAINER_MAGIC.decode() + ' ')
+
+
+def unpack_text(container):
+    """
+    Разбирает текстовую форму контейнера.
+
+    Возвращает:
+    ContainerHeader, str: Заголовок и шифртекст.
+    """
+    line_end = container.find('\n')
+    if line_end < 0:
+        raise ValueError("Not a grid cipher container: bad header.")
+    header = ContainerHeader.from_text(container[:line_end])
+    ciphertext = container[line_end + 1:]
+    if len(ciphertext) != header.block_count * header.rows * header.cols:
+        raise ValueError("Grid cipher container is truncated or corrupted.")
+    return header, ciphertext
+
+
+def decrypt_text(cipher, container):
+    """Дешифрует текстовую форму контейнера, проверяя ключ."""
+    header, ciphertext = unpack_text(container)
+    header.check_key(cipher.key)
+    return cipher.decrypt(ciphertext, header.length)
+
+
+class ContainerWriter:
+    """
+    Записывает двоичный контейнер в файл по частям.
+
+    Длина текста и количество блоков становятся известны только в конце, поэтому
+    заголовок записывается при закрытии поверх временного; файл должен поддерживать seek.
+    """
+    def __init__(self, cipher, file, offsets=True, alphabet=None):
+        """
+        Параметры:
+        cipher (GridCipher | ByteGridCipher): Шифратор; для ByteGridCipher данные - байты.
+        file: Двоичный файл, открытый на запись.
+        offsets (bool): Записать таблицу смещений блоков (нужна для произвольного доступа
+            к текстовым блокам; байтовые блоки имеют постоянную длину и читаются без нее).
+        alphabet (list): Алфавит для случайных символов. По умолчанию выбирается по первой части.
+        """
+        if not cipher.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        self.cipher = cipher
+        self.file = file
+        self.binary = isinstance(cipher, ByteGridCipher)
+        self.flags = (FLAG_OFFSETS if offsets else 0) | (FLAG_BYTES if self.binary else 0)
+        self.alphabet = alphabet
+        self.length = 0
+        self.block_count = 0
+        self.offsets = array('Q', [0]) if offsets else None
+        self.pending = b'' if self.binary else ''
+        self.start = file.tell()
+        file.write(bytes(_HEADER.size))
+
+    def _write_blocks(self, data):
+        if self.alphabet is None and not self.binary:
+            # Алфавит заполнения выбирается по первой части и дальше не меняется
+            self.alphabet = self.cipher.resolve_alphabet(data)
+        ciphertext = self.cipher.encrypt(data, self.alphabet)
+        block_size = self.cipher.block_size
+        for start in range(0, len(ciphertext), block_size):
+            block = ciphertext[start:start + block_size]
+            encoded = block if self.binary else block.encode(_ENCODING, 'surrogatepass')
+            self.file.write(encoded)
+            if self.offsets is not None:
+                self.offsets.append(self.offsets[-1] + len(encoded))
+        self.block_count += len(ciphertext) // block_size
+
+    def write(self, data):
+        """Шифрует и записывает очередную часть открытого текста; неполный блок откладывается."""
+        self.length += len(data)
+        data = self.pending + data
+        full = len(data) - len(data) % self.cipher.max_length
+        if full:
+            self._write_blocks(data[:full])
+        self.pending = data[full:]
+
+    def close(self):
+        """
+        Дописывает последний блок и таблицу смещений и записывает заголовок.
+
+        Возвращает:
+        ContainerHeader: Записанный заголовок.
+        """
+        if self.pending:
+            self._write_blocks(self.pending)
+            self.pending = self.pending[:0]
+        header = ContainerHeader.for_key(self.cipher.key, self.length, self.block_count, self.flags)
+        if self.offsets is not None:
+            header.index = self.file.tell() - self.start
+            self.file.write(_offsets_to_bytes(self.offsets))
+        end = self.file.tell()
+        self.file.seek(self.start)
+        self.file.write(header.to_bytes())
+        self.file.seek(end)
+        return header
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+
+
+def write_container(cipher, data, file, offsets=True, alphabet=None):
+    """
+    Шифрует данные целиком и записывает двоичный контейнер.
+
+    Возвращает:
+    ContainerHeader: Записанный заголовок.
+    """
+    writer = ContainerWriter(cipher, file, offsets, alphabet)
+    writer.write(data)
+    return writer.close()
+
+
+class ContainerReader:
+    """
+    Читает двоичный контейнер с произвольным доступом к блокам.
+
+    Блок с номером N читается одним seek: для байтовых блоков смещение вычисляется,
+    для текстовых берется из таблицы смещений. Без таблицы текстовые блоки один раз
+    декодируются целиком. Полное дешифрование читает блоки последовательно частями.
+    """
+    def __init__(self, file, key=None):
+        """
+        Параметры:
+        file: Двоичный файл, открытый на чтение (с поддержкой seek).
+        key (GridKey): Если задан, проверяется, что контейнер зашифрован этим ключом.
+        """
+        self.file = file
+        self.start = file.tell()
+        self.header = ContainerHeader.from_bytes(file.read(_HEADER.size))
+        if key is not None:
+            self.header.check_key(key)
+        self.block_size = self.header.rows * self.header.cols
+        self.binary = bool(self.header.flags & FLAG_BYTES)
+        self._decoded = None
+
+    @property
+    def data_start(self):
+        """Смещение первого блока в файле."""
+        return self.start + _HEADER.size
+
+    def _span(self, index):
+        """Начало и конец блока относительно начала блоков (в байтах)."""
+        if self.binary:
+            return index * self.block_size, (index + 1) * self.block_size
+        self.file.seek(self.start + self.header.index + index * _OFFSET.size)
+        data = self.file.read(2 * _OFFSET.size)
+        if len(data) != 2 * _OFFSET.size:
+            raise ValueError("Grid cipher container is truncated or corrupted.")
+        return tuple(_offsets_from_bytes(data))
+
+    def read_block(self, index):
+        """
+        Возвращает блок шифртекста с номером index.
+
+        Возвращает:
+        str | bytes: Блок из rows * cols символов (байтов).
+        """
+        if not 0 <= index < self.header.block_count:
+            raise IndexError(f"Block {index} is out of range (container has {self.header.block_count}).")
+        if not self.binary and not self.header.flags & FLAG_OFFSETS:
+            if self._decoded is None:
+                self.file.seek(self.data_start)
+                self._decoded = self.file.read().decode(_ENCODING, 'surrogatepass')
+            return self._decoded[index * self.block_size:(index + 1) * self.block_size]
+        start, end = self._span(index)
+        self.file.seek(self.data_start + start)
+        data = self.file.read(end - start)
+        if len(data) != end - start:
+            raise ValueError("Grid cipher container is truncated or corrupted.")
+        return data if self.binary else data.decode(_ENCODING, 'surrogatepass')
+
+    def block_length(self, cipher, index):
+        """Количество символов открытого текста в блоке index."""
+        return max(0, min(cipher.max_length, self.header.length - index * cipher.max_length))
+
+    def decrypt_block(self, cipher, index):
+        """Дешифрует только блок с номером index."""
+        self.header.check_key(cipher.key)
+        return cipher.decrypt_block(self.read_block(index), self.block_length(cipher, index))
+
+    def decrypt_range(self, cipher, start, end):
+        """
+        Дешифрует символы открытого текста с номерами от start до end (не включительно),
+        читая из файла только блоки, в которые попадает диапазон.
+        """
+        self.header.check_key(cipher.key)
+        if 0 <= start <= end and start >= self.header.length:
+            # Диапазон за концом текста пуст, как в GridCipher.decrypt_range
+            return b'' if self.binary else ''
+        end = min(end, self.header.length)
+        parts = []
+        for block, _ in cipher.range_cells(start, end):
+            offset = block * cipher.max_length
+            parts.append(cipher.decrypt_range(self.read_block(block), max(start - offset, 0), end - offset))
+        return b''.join(parts) if self.binary else ''.join(parts)
+
+    def iter_decrypt(self, cipher, chunk_blocks=DEFAULT_CHUNK_BLOCKS):
+        """
+        Дешифрует контейнер последовательно, по chunk_blocks блоков за раз.
+
+        Возвращает:
+        generator: Части открытого текста.
+        """
+        self.header.check_key(cipher.key)
+        block_size = self.block_size
+        # Таблица смещений лежит после блоков, поэтому чтение ограничивается концом блоков
+        data_left = self.header.index - _HEADER.size if self.header.flags & FLAG_OFFSETS else None
+        decoder = None if self.binary else codecs.getincrementaldecoder(_ENCODING)('surrogatepass')
+        pending = b'' if self.binary else ''
+        remaining = self.header.length
+        self.file.seek(self.data_start)
+        while remaining > 0:
+            # В UTF-8 символ занимает хотя бы байт, поэтому лишних символов не прочитается
+            size = block_size * chunk_blocks - len(pending)
+            if data_left is not None:
+                size = min(size, data_left)
+                data_left -= size
+            data = self.file.read(size) if size > 0 else b''
+            if not data:
+                raise ValueError("Grid cipher container is truncated or corrupted.")
+            pending += data if self.binary else decoder.decode(data)
+            ready = len(pending) // block_size * block_size
+            if ready:
+                plain = cipher.decrypt(pending[:ready], min(remaining, ready // block_size * cipher.max_length))
+                remaining -= len(plain)
+                pending = pending[ready:]
+                yield plain
+
+    def decrypt(self, cipher):
+        """Дешифрует контейнер целиком."""
+        parts = list(self.iter_decrypt(cipher))
+        return b''.join(parts) if self.binary else ''.join(parts)
@@ -0,0 +1,413 @@
+"""
+Ядро шифра поворачивающейся решетки. Не зависит от tkinter и может использоваться
+без графического интерфейса (в скриптах, сервисах и пакетной обработке).
+"""
+from collections.abc import Hashable
+from operator import itemgetter
+
+from . import metrics
+from .alphabet import AlphabetManager
+from .key import GridKey
+from .padding import PaddingSource
+
+
+# Сколько ячеек переставлять одной выборкой при пакетной обработке коротких сообщений
+BATCH_CELLS = 1 << 14
+# Сколько символов большого блока собирать за одну выборку
+GATHER_CELLS = 1 << 12
+
+
+def _gatherer(positions):
+    """Возвращает функцию, собирающую символы строки по списку позиций в одну строку."""
+    if len(positions) == 1:
+        position = positions[0]
+        return lambda text: text[position]
+    if len(positions) <= GATHER_CELLS:
+        getter = itemgetter(*positions)
+        return lambda text: ''.join(getter(text))
+    # Большой блок собирается частями: выборка создает объект на каждый символ, и так
+    # одновременно существуют не больше GATHER_CELLS таких объектов, а не по одному на ячейку
+    getters = [itemgetter(*positions[start:start + GATHER_CELLS]) for start in range(0, len(positions), GATHER_CELLS)]
+    return lambda text: ''.join([''.join(getter(text)) for getter in getters])
+
+
+def _tile(positions, stride, count):
+    """Повторяет таблицу позиций для count подряд идущих блоков длиной stride."""
+    return [block * stride + position for block in range(count) for position in positions]
+
+
+class GridCipher:
+    """
+    Шифр поворачивающейся решетки: ключ (решетка), алфавит и генератор случайных чисел
+    для заполнения пустых ячеек.
+
+    Ключ не изменяется при шифровании, поэтому один GridKey можно использовать в разных
+    шифраторах, потоках и процессах. Сам шифратор хранит буферы символов заполнения,
+    поэтому в каждом потоке лучше создавать свой.
+    """
+    _make_gatherer = staticmethod(_gatherer)
+    _empty = ''
+
+    def __init__(self, key, alphabet=None, rng=None):
+        """
+        Параметры:
+        key (GridKey): Ключ - размеры решетки и набор дырок.
+        alphabet (list): Алфавит для случайных символов. Если не задан, выбирается по тексту.
+        rng (random.Random): Генератор случайных байтов (randbytes) для заполнения пустых ячеек.
+            По умолчанию - os.urandom; random.Random(seed) дает воспроизводимое заполнение.
+        """
+        if not isinstance(key, GridKey):
+            raise TypeError(f"Expected GridKey, got {type(key).__name__}")
+        self.key = key
+        self.grid_rows = key.rows
+        self.grid_cols = key.cols
+        self.alphabet = alphabet
+        self.rng = rng
+        self._padding = {}
+        self._last_padding = (None, None)
+        self._batch_gatherers = {}
+
+        # Порядок записи вычисляется ключом один раз: дальше шифрование блока - это одна
+        # запись символов по таблице, а дешифрование - одна выборка по ней же.
+        self.write_order = key.write_order
+        self._read_block = _gatherer(self.write_order) if self.write_order else None
+        self._write_block = _gatherer(key.cell_sources) if self.write_order else None
+
+    @property
+    def max_length(self):
+        """Количество символов текста, помещающихся в одну решетку (4 положения)."""
+        return len(self.write_order)
+
+    @property
+    def block_size(self):
+        """Количество символов шифртекста в одной решетке."""
+        return self.grid_rows * self.grid_cols
+
+    def padding_source(self, alphabet):
+        """Возвращает буферизованный источник символов заполнения для алфавита."""
+        last_alphabet, source = self._last_padding
+        if alphabet is last_alphabet:
+            return source
+        cache_key = alphabet if isinstance(alphabet, Hashable) else tuple(alphabet)  # список символов
+        source = self._padding.get(cache_key)
+        if source is None:
+            random_bytes = self.rng.randbytes if self.rng is not None else None
+            source = self._padding[cache_key] = PaddingSource(alphabet, random_bytes)
+        self._last_padding = (alphabet, source)
+        return source
+
+    def split_text(self, text):
+        """Разделяет открытый текст на подстроки, помещающиеся в одну решетку."""
+        return [text[i:i + self.max_length] for i in range(0, len(text), self.max_length)]
+
+    def split_ciphertext(self, ciphertext):
+        """Разделяет шифртекст на подстроки длиной в одну решетку."""
+        return [ciphertext[i:i + self.block_size] for i in range(0, len(ciphertext), self.block_size)]
+
+    def encrypt_block(self, substring, alphabet):
+        """
+        Шифрует подстроку длиной не более max_length и возвращает блок шифртекста.
+
+        Параметры:
+        substring (str): Подстрока для шифрования.
+        alphabet (list): Алфавит для случайных символов.
+
+        Возвращает:
+        str: Зашифрованный текст длиной rows * cols.
+        """
+        substring = substring[:self.max_length]
+        # Недостающие символы текста заполняются так же, как свободные ячейки (как в ByteGridCipher):
+        # дешифрование их все равно отбросит, а блок собирается выборкой по cell_sources
+        # без списка ячеек и множества занятых позиций
+        return self._write_block(substring + self.padding_source(alphabet).take(self.block_size - len(substring)))
+
+    def decrypt_block(self, substring, length):
+        """
+        Извлекает из блока шифртекста первые length символов открытого текста.
+
+        Параметры:
+        substring (str): Блок шифртекста.
+        length (int): Сколько символов открытого текста нужно извлечь.
+
+        Возвращает:
+        str: Расшифрованный текст.
+        """
+        if length >= self.max_length and len(substring) == self.block_size:
+            return self._read_block(substring)
+        size = len(substring)
+        return ''.join([substring[position] for position in self.write_order if position < size][:length])
+
+    def range_cells(self, start, end):
+        """
+        Определяет, где лежат символы открытого текста с номерами от start до end (не включительно).
+
+        Возвращает:
+        generator: Пары (номер блока, номера ячеек блока по порядку записи).
+        """
+        if start < 0 or end < start:
+            raise ValueError(f"Invalid range: {start}..{end}.")
+        capacity = self.max_length
+        for block in range(start // capacity, -(-end // capacity)):
+            offset = block * capacity
+            yield block, self.write_order[max(start - offset, 0):min(end - offset, capacity)]
+
+    def decrypt_range(self, ciphertext, start, end):
+        """
+        Дешифрует только символы открытого текста с номерами от start до end (не включительно).
+
+        Читаются лишь блоки, в которые попадает диапазон, и в них - лишь нужные ячейки,
+        поэтому время зависит от длины диапазона, а не от длины шифртекста. Как и decrypt,
+        за пределами исходного сообщения возвращает символы заполнения, поэтому end не должен
+        превышать длину открытого текста.
+
+        Параметры:
+        ciphertext (str): Шифртекст.
+        start (int): Номер первого символа.
+        end (int): Номер символа после последнего.
+
+        Возвращает:
+        str: Символы открытого текста start..end-1 (меньше, если шифртекст короче).
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        parts = []
+        for block, positions in self.range_cells(start, end):
+            cells = ciphertext[block * self.block_size:(block + 1) * self.block_size]
+            if not cells:
+                break
+            if len(positions) == self.max_length and len(cells) == self.block_size:
+                parts.append(self._read_block(cells))
+            else:
+                parts.append(''.join([cells[position] for position in positions if position < len(cells)]))
+        return ''.join(parts)
+
+    def to_grid(self, block):
+        """Преобразует блок шифртекста в сетку (список строк) для отображения."""
+        grid = [[None for _ in range(self.grid_cols)] for _ in range(self.grid_rows)]
+        for index, char in enumerate(block):
+            grid[index // self.grid_cols][index % self.grid_cols] = char
+        return grid
+
+    def encrypt_substring(self, substring, alphabet):
+        """
+        Шифрует подстроку текста и возвращает зашифрованную сетку и текст.
+
+        Параметры:
+        substring (str): Подстрока для шифрования.
+        alphabet (list): Алфавит для случайных символов.
+
+        Возвращает:
+        list, str: Сетка с зашифрованными символами и зашифрованный текст.
+        """
+        encrypted_text = self.encrypt_block(substring, alphabet)
+        return self.to_grid(encrypted_text), encrypted_text
+
+    def decrypt_substring(self, substring, original_message_length):
+        """
+        Дешифрует подстроку текста и возвращает решетку и расшифрованный текст.
+
+        Параметры:
+        substring (str): Подстрока для дешифрования.
+        original_message_length (int): Сколько символов открытого текста нужно извлечь.
+
+        Возвращает:
+        list, str: Сетка с оставшимися символами и расшифрованный текст.
+        """
+        decrypted_text = self.decrypt_block(substring, original_message_length)
+        grid = self.to_grid(substring)
+        for position in self.write_order[:len(decrypted_text)]:
+            grid[position // self.grid_cols][position % self.grid_cols] = None
+        return grid, decrypted_text
+
+    def _batch_gatherer(self, direction, count):
+        """
+        Возвращает выборку, переставляющую сразу count подряд идущих блоков.
+
+        Параметры:
+        direction (str): 'encrypt' - сборка блоков шифртекста из строк «текст + заполнение»
+            длиной block_size, 'decrypt' - извлечение max_length символов из каждого блока.
+        count (int): Количество блоков.
+        """
+        gather = self._batch_gatherers.get((direction, count))
+        if gather is None:
+            positions = self.key.cell_sources if direction == 'encrypt' else self.write_order
+            gather = self._make_gatherer(_tile(positions, self.block_size, count))
+            self._batch_gatherers[(direction, count)] = gather
+        return gather
+
+    def _permute_blocks(self, data, blocks, direction):
+        """Переставляет blocks подряд идущих блоков данных группами по BATCH_CELLS ячеек."""
+        group = max(1, BATCH_CELLS // self.block_size)
+        size = self.block_size
+        gather = self._batch_gatherer(direction, group)
+        parts = [gather(data[start * size:(start + group) * size]) for start in range(0, blocks - group + 1, group)]
+        # Остаток переставляется по одному блоку: таблица на каждый размер остатка заняла бы
+        # память на все время жизни шифратора, а так их ровно две на направление
+        gather = self._batch_gatherer(direction, 1)
+        parts += [gather(data[start * size:(start + 1) * size]) for start in range(blocks - blocks % group, blocks)]
+        return self._empty.join(parts)
+
+    def _batch_padding(self, alphabet):
+        """Возвращает источник заполнения для пакетного шифрования."""
+        return self.padding_source(alphabet)
+
+    def encrypt_many(self, messages, alphabet=None):
+        """
+        Шифрует много коротких сообщений за один проход.
+
+        Каждое сообщение шифруется независимо (как encrypt), но блоки всех сообщений
+        собираются в общий буфер и переставляются общими выборками, поэтому на сообщение
+        приходится лишь копирование его символов и среза заполнения. Если алфавит не задан
+        ни здесь, ни при создании шифратора, он определяется для каждого сообщения отдельно.
+
+        Параметры:
+        messages (iterable): Открытые тексты.
+        alphabet (list): Алфавит для случайных символов.
+
+        Возвращает:
+        list: Шифртексты в порядке сообщений.
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+
+        capacity, size = self.max_length, self.block_size
+        fixed = alphabet if alphabet is not None else self.alphabet
+        manager = AlphabetManager() if fixed is None else None
+        padding = self._batch_padding(fixed) if fixed is not None else None
+        pieces = []
+        counts = []
+        characters = 0
+        for message in messages:
+            length = len(message)
+            if manager is not None and length:
+                manager.choose_alphabet(message)
+                padding = self._batch_padding(manager.get_alphabet())
+            if length <= capacity:
+                # Одноблочное сообщение - самый частый случай: текст и заполнение до конца блока
+                if length:
+                    pieces += (message, padding.take(size - length))
+                counts.append(1 if length else 0)
+            else:
+                for start in range(0, length, capacity):
+                    chunk = message[start:start + capacity]
+                    pieces += (chunk, padding.take(size - len(chunk)))
+                counts.append(-(-length // capacity))
+            characters += length
+
+        blocks = sum(counts)
+        with metrics.stage('permutation'):
+            ciphertext = self._permute_blocks(self._empty.join(pieces), blocks, 'encrypt')
+        with metrics.stage('assembly'):
+            results = []
+            offset = 0
+            for count in counts:
+                results.append(ciphertext[offset:offset + count * size])
+                offset += count * size
+        metrics.count('messages', len(counts))
+        metrics.count('blocks', blocks)
+        metrics.count('characters', characters)
+        return results
+
+    def decrypt_many(self, ciphertexts, lengths):
+        """
+        Дешифрует много коротких шифртекстов за один проход (обратная операция к encrypt_many).
+
+        Параметры:
+        ciphertexts (iterable): Шифртексты.
+        lengths (iterable): Длины исходных сообщений в том же порядке.
+
+        Возвращает:
+        list: Открытые тексты в порядке шифртекстов.
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+
+        capacity, size = self.max_length, self.block_size
+        pieces = []
+        slots = []  # (смещение в общем открытом тексте, длина, шифртекст неполной длины или None)
+        blocks = 0
+        for ciphertext, length in zip(ciphertexts, lengths):
+            if len(ciphertext) % size:
+                slots.append((0, length, ciphertext))
+                continue
+            count = min(len(ciphertext) // size, -(-length // capacity)) if length > 0 else 0
+            pieces.append(ciphertext[:count * size])
+            slots.append((blocks * capacity, min(length, count * capacity), None))
+            blocks += count
+
+        with metrics.stage('permutation'):
+            plaintext = self._permute_blocks(self._empty.join(pieces), blocks, 'decrypt')
+        with metrics.stage('assembly'):
+            results = []
+            for start, length, truncated in slots:
+                if truncated is None:
+                    results.append(plaintext[start:start + length])
+                else:
+                    results.append(self.decrypt(truncated, length))
+        metrics.count('messages', len(slots))
+        metrics.count('blocks', blocks)
+        metrics.count('characters', len(plaintext))
+        return results
+
+    def resolve_alphabet(self, text):
+        """Возвращает алфавит для заполнения: заданный при создании или определенный по тексту."""
+        if self.alphabet is not None:
+            return self.alphabet
+        alphabet_manager = AlphabetManager()
+        alphabet_manager.choose_alphabet(text)
+        return alphabet_manager.get_alphabet()
+
+    def encrypt(self, text, alphabet=None):
+        """
+        Шифрует текст целиком, разбивая его на решетки.
+
+        Параметры:
+        text (str): Открытый текст.
+        alphabet (list): Алфавит для случайных символов. По умолчанию - алфавит шифратора
+            или определенный по тексту.
+
+        Возвращает:
+        str: Шифртекст длиной, кратной rows * cols.
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+
+        if alphabet is None:
+            alphabet = self.resolve_alphabet(text)
+        with metrics.stage('permutation'):
+            blocks = [self.encrypt_block(substring, alphabet) for substring in self.split_text(text)]
+        with metrics.stage('assembly'):
+            ciphertext = ''.join(blocks)
+        metrics.count('blocks', len(blocks))
+        metrics.count('characters', len(text))
+        return ciphertext
+
+    def decrypt(self, ciphertext, length):
+        """
+        Дешифрует шифртекст.
+
+        Параметры:
+        ciphertext (str): Шифртекст.
+        length (int): Длина исходного сообщения.
+
+        Возвращает:
+        str: Открытый текст длиной не более length.
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+
+        decrypted = []
+        remaining = length
+        with metrics.stage('permutation'):
+            for substring in self.split_ciphertext(ciphertext):
+                if remaining <= 0:
+                    break
+                decrypted_text = self.decrypt_block(substring, min(remaining, self.max_length))
+                decrypted.append(decrypted_text)
+                remaining -= len(decrypted_text)
+
+        with metrics.stage('assembly'):
+            plaintext = ''.join(decrypted)[:length]
+        metrics.count('blocks', len(decrypted))
+        metrics.count('characters', len(plaintext))
+        return plaintext
@@ -0,0 +1,435 @@
+import bisect
+import logging
+import tkinter as tk
+from tkinter import simpledialog, messagebox, ttk
+
+from .alphabet import AlphabetManager
+from .container import ContainerHeader, is_text_container, unpack_text
+from .engine import GridCipher
+from .jobs import CipherJob, decryption_parts, encryption_parts
+from .key import GridKey
+from .orbits import OccupancyMap, random_holes
+from .viewer import EncryptedGridViewer
+
+MAX_GRID_SIZE = 100  # Наибольший размер решетки, который удобно редактировать в окне
+GRID_PIXELS = 700  # Размер области рисования решетки в пикселях
+POLL_INTERVAL = 50  # Период опроса фонового шифрования в миллисекундах
+
+logger = logging.getLogger(__name__)
+
+
+class AlphabetSelectionDialog(tk.Toplevel):
+    """
+    Диалоговое окно для выбора алфавита (латиница или кириллица).
+    """
+    def __init__(self, parent):
+        """Инициализация диалога. Создание кнопок выбора алфавита."""
+        super().__init__(parent)
+        self.result = None
+        self.title("Choose Alphabet")
+        self.geometry("250x100")
+
+        label = tk.Label(self, text="Please choose the alphabet:")
+        label.pack(pady=10)
+
+        latin_button = tk.Button(self, text="Latin", command=self.choose_latin)
+        latin_button.pack(side=tk.LEFT, padx=10)
+
+        cyrillic_button = tk.Button(self, text="Cyrillic", command=self.choose_cyrillic)
+        cyrillic_button.pack(side=tk.RIGHT, padx=10)
+
+    def choose_latin(self):
+        """Выбирает латинский алфавит."""
+        self.result = 'latin'
+        self.destroy()
+
+    def choose_cyrillic(self):
+        """Выбирает кириллический алфавит."""
+        self.result = 'cyrillic'
+        self.destroy()
+
+    def show(self):
+        """Отображает диалоговое окно и ожидает выбора пользователя."""
+        self.grab_set()
+        self.wait_window()
+        return self.result
+
+
+class GridCipherApp:
+    """
+    Приложение для реализации шифра на основе поворачивающейся решетки.
+    """
+    def __init__(self, master):
+        """Инициализация основного окна и создание элементов интерфейса."""
+        self.output_text = None
+        self.input_text = None
+        self.encrypted_viewer = None
+        self.canvas = None
+        self.progress = None
+        self.cancel_button = None
+        self.action_buttons = []
+        self.job = None
+        self.alphabet_manager = AlphabetManager()
+        self.master = master
+        self.master.title("Turning Grid Cipher")
+
+        self.grid_rows = 20  # По умолчанию 20x20
+        self.grid_cols = 20
+        self.cell_size = GRID_PIXELS // 20
+        self.cells = {}
+        self.cells_shape = None  # (rows, cols, cell_size), для которых нарисованы self.cells
+        self.painted = set()  # ячейки, закрашенные на холсте как дырки
+        self.holes = []
+        self.max_length = 0
+        self.step_grid = None
+        self.occupancy = OccupancyMap(self.grid_rows, self.grid_cols)
+        self.create_ui()
+
+    def create_ui(self):
+        """
+        Создает пользовательский интерфейс приложения с полями ввода, кнопками и сеткой.
+        """
+        # Frame для шифруемой решетки (левая часть)
+        grid_frame = tk.Frame(self.master)
+        grid_frame.pack(side=tk.LEFT, padx=18, pady=18)
+
+        self.canvas = tk.Canvas(grid_frame, width=self.grid_cols * self.cell_size,
+                                height=self.grid_rows * self.cell_size)
+        self.canvas.pack()
+        # Один обработчик щелчков на весь холст вместо отдельного на каждую ячейку
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
+
+        # Frame для отображения зашифрованных решеток (с прокруткой справа от шифровальной решетки)
+        encrypted_grid_frame = tk.Frame(self.master)
+        encrypted_grid_frame.pack(side=tk.LEFT, padx=18, pady=18)
+
+        # Один холст с прокруткой, на котором рисуются только видимые решетки
+        self.encrypted_viewer = EncryptedGridViewer(encrypted_grid_frame, width=self.grid_cols * self.cell_size + 40,
+                                                    height=self.grid_rows * self.cell_size + 20)
+
+        # Frame для элементов управления (правая часть)
+        controls_frame = tk.Frame(self.master)
+        controls_frame.pack(side=tk.RIGHT, padx=20, pady=20, fill=tk.Y)
+
+        # Поле для шифруемого текста с прокруткой
+        tk.Label(controls_frame, text="Text to encrypt:").pack(anchor=tk.W)
+        input_text_frame = tk.Frame(controls_frame)
+        input_text_frame.pack()
+
+        input_text_scroll = tk.Scrollbar(input_text_frame, orient=tk.VERTICAL)
+        self.input_text = tk.Text(input_text_frame, height=5, width=30, yscrollcommand=input_text_scroll.set)
+        input_text_scroll.config(command=self.input_text.yview)
+        input_text_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.input_text.pack(side=tk.LEFT, fill=tk.BOTH)
+
+        # Кнопки управления
+        tk.Button(controls_frame, text="Set grid size", command=self.set_grid_size).pack(anchor=tk.W, pady=5)
+        tk.Button(controls_frame, text="Generate random grid", command=self.generate_random_grid).pack(anchor=tk.W,
+                                                                                                       pady=5)
+        tk.Button(controls_frame, text="Clear selected cells", command=self.clear_holes).pack(anchor=tk.W, pady=5)
+        self.action_buttons = [
+            tk.Button(controls_frame, text="Encrypt text", command=self.encrypt_text),
+            tk.Button(controls_frame, text="Decrypt text", command=self.decrypt_text),
+        ]
+        for button in self.action_buttons:
+            button.pack(anchor=tk.W, pady=5)
+
+        # Ход фонового шифрования и его отмена
+        progress_frame = tk.Frame(controls_frame)
+        progress_frame.pack(anchor=tk.W, fill=tk.X, pady=5)
+        self.progress = ttk.Progressbar(progress_frame, orient=tk.HORIZONTAL, mode='determinate', maximum=1.0)
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_button = tk.Button(progress_frame, text="Cancel", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+
+        # Поле для зашифрованного текста с прокруткой
+        tk.Label(controls_frame, text="Encrypted text:").pack(anchor=tk.W, pady=10)
+        output_text_frame = tk.Frame(controls_frame)
+        output_text_frame.pack()
+
+        output_text_scroll = tk.Scrollbar(output_text_frame, orient=tk.VERTICAL)
+        self.output_text = tk.Text(output_text_frame, height=5, width=30, yscrollcommand=output_text_scroll.set)
+        output_text_scroll.config(command=self.output_text.yview)
+        output_text_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.output_text.pack(side=tk.LEFT, fill=tk.BOTH)
+
+        # Добавляем поле для расшифрованного текста с прокруткой
+        tk.Label(controls_frame, text="Decrypted text:").pack(anchor=tk.W, pady=10)
+        decrypted_text_frame = tk.Frame(controls_frame)
+        decrypted_text_frame.pack()
+
+        decrypted_text_scroll = tk.Scrollbar(decrypted_text_frame, orient=tk.VERTICAL)
+        self.decrypted_text = tk.Text(decrypted_text_frame, height=5, width=30,
+                                      yscrollcommand=decrypted_text_scroll.set)
+        decrypted_text_scroll.config(command=self.decrypted_text.yview)
+        decrypted_text_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.decrypted_text.pack(side=tk.LEFT, fill=tk.BOTH)
+
+        self.create_grid()
+
+    def ask_grid_size(self):
+        """
+        Запрашивает у пользователя размер решетки, повторяя запрос при некорректном вводе.
+
+        Возвращает:
+        tuple: (rows, cols) или None, если пользователь закрыл окно.
+        """
+        prompt = f"Enter number of {{}} (2-{MAX_GRID_SIZE}):"
+        while True:
+            rows = simpledialog.askinteger("Input", prompt.format("rows"), parent=self.master)
+            if rows is None:  # Пользователь закрыл окно
+                return None
+            if rows < 2 or rows > MAX_GRID_SIZE:
+                messagebox.showerror("Error", f"Rows must be between 2 and {MAX_GRID_SIZE}.")
+                continue  # Повторяем запрос, если введены неправильные данные
+            cols = simpledialog.askinteger("Input", prompt.format("columns"), parent=self.master)
+            if cols is None:  # Пользователь закрыл окно
+                return None
+            if cols < 2 or cols > MAX_GRID_SIZE:
+                messagebox.showerror("Error", f"Columns must be between 2 and {MAX_GRID_SIZE}.")
+                continue  # Повторяем запрос, если введены неправильные данные
+            return rows, cols
+
+    def set_grid_size(self):
+        """
+        Устанавливает размер сетки на основе ввода пользователя. Проверяет ввод на корректность.
+        """
+        self.occupancy.clear()
+        self.holes.clear()
+        size = self.ask_grid_size()
+        if size is not None:
+            self.grid_rows, self.grid_cols = size
+            self.occupancy = OccupancyMap(self.grid_rows, self.grid_cols)
+        # Дырки уже сняты, поэтому решетку нужно перерисовать и при отмене ввода
+        self.create_grid()
+
+    def generate_random_grid(self):
+        """
+        Генерирует случайную сетку с заданными параметрами и случайными дырками (отверстиями).
+        Учитывает наложения дырок при повороте, отражении и повороте после отражения.
+        """
+        size = self.ask_grid_size()
+        if size is None:
+            return
+        self.grid_rows, self.grid_cols = size
+
+        # Создаем решетку с максимальным числом случайных дырок: по одной в каждой орбите
+        self.holes = random_holes(self.grid_rows, self.grid_cols)
+        self.occupancy = OccupancyMap(self.grid_rows, self.grid_cols, self.holes)
+        self.create_grid()
+
+    def create_grid(self):
+        """
+        Отображает сетку на основе текущих параметров (размеры и дырки).
+
+        Прямоугольники ячеек пересоздаются только при изменении размеров решетки;
+        иначе перекрашиваются лишь ячейки, состояние которых изменилось.
+        """
+        # Размер ячейки подбирается так, чтобы решетка помещалась в область рисования
+        self.cell_size = max(1, GRID_PIXELS // max(self.grid_rows, self.grid_cols, 20))
+        shape = (self.grid_rows, self.grid_cols, self.cell_size)
+
+        if shape != self.cells_shape:
+            self.canvas.delete("all")
+            self.cells = {}
+            self.painted = set()
+            self.cells_shape = shape
+            for i in range(self.grid_rows):
+                for j in range(self.grid_cols):
+                    x1 = j * self.cell_size
+                    y1 = i * self.cell_size
+                    x2 = x1 + self.cell_size
+                    y2 = y1 + self.cell_size
+                    self.cells[(i, j)] = self.canvas.create_rectangle(x1, y1, x2, y2, fill="white")
+
+        holes = set(self.holes)
+        for cell in self.painted - holes:
+            self.canvas.itemconfig(self.cells[cell], fill="white")
+        for cell in holes - self.painted:
+            self.canvas.itemconfig(self.cells[cell], fill="black")
+        self.painted = holes
+
+    def on_canvas_click(self, event):
+        """Переводит координаты щелчка в ячейку решетки и переключает в ней дырку."""
+        row = event.y // self.cell_size
+        col = event.x // self.cell_size
+        if 0 <= row < self.grid_rows and 0 <= col < self.grid_cols:
+            self.toggle_hole(row, col)
+
+    def toggle_hole(self, row, col):
+        """
+        Добавляет или удаляет дырку в указанной ячейке. Проверяет на наличие перекрытий после поворота.
+
+        Параметры:
+        row (int): Строка ячейки.
+        col (int): Колонка ячейки.
+        """
+        cell = (row, col)
+        if cell in self.painted:
+            self.holes.remove(cell)
+            self.occupancy.remove(row, col)
+            self.painted.discard(cell)
+            self.canvas.itemconfig(self.cells[cell], fill="white")
+            logger.debug("Removed hole %s", cell)
+            return
+
+        if not self.occupancy.add(row, col):
+            logger.debug("Hole %s overlaps with another after rotation", cell)
+            messagebox.showerror("Error", "This hole overlaps with another after rotation!")
+            return
+        logger.debug("Added hole %s", cell)
+        bisect.insort(self.holes, cell)
+        self.painted.add(cell)
+        self.canvas.itemconfig(self.cells[cell], fill="black")
+
+    def clear_holes(self):
+        """Очищает выбранные дырки из сетки."""
+        self.holes.clear()
+        self.occupancy.clear()
+        self.create_grid()
+        logger.debug("Cleared holes")
+
+    def check_overlap(self, r, c):
+        """
+        Проверяет, будет ли добавленная дырка перекрываться с существующими
+        дырками на любом этапе поворота или отражения решетки.
+
+        Параметры:
+        r (int): Строка новой ячейки (дырки).
+        c (int): Колонка новой ячейки (дырки).
+
+        Возвращает:
+        bool: True, если новая дырка перекрывается с существующими.
+        """
+        return self.occupancy.overlaps(r, c)
+
+    def make_cipher(self):
+        """Создает шифратор для текущих размеров решетки и дырок."""
+        return GridCipher(GridKey(self.grid_rows, self.grid_cols, self.holes))
+
+    def decrypt_text(self):
+        """
+        Дешифрует текст, введенный пользователем, используя текущую решетку и алфавит.
+        """
+        contents = self.output_text.get("1.0", "end-1c")
+        encrypted_text = contents.strip()
+        if not encrypted_text:
+            messagebox.showerror("Error", "No encrypted text to decrypt!")
+            return
+        if not self.holes:
+            messagebox.showerror("Error", "The grid is empty. No holes selected!")
+            return
+
+        if is_text_container(encrypted_text):
+            # Длина открытого текста и ключ записаны в заголовке контейнера; пробелы в конце
+            # могут быть символами последнего блока, поэтому текст не обрезается справа
+            try:
+                header, encrypted_text = unpack_text(contents.lstrip())
+                header.check_key(GridKey(self.grid_rows, self.grid_cols, self.holes))
+            except ValueError as error:
+                messagebox.showerror("Error", str(error))
+                return
+            original_message_length = header.length
+        else:
+            # Шифртекст без заголовка: длину можно взять только из поля исходного текста
+            original_message_length = len(self.input_text.get("1.0", tk.END).strip())
+            if original_message_length == 0:
+                messagebox.showerror("Error", "No original message length available for decryption!")
+                return
+
+        cipher = self.make_cipher()
+        self.max_length = cipher.max_length
+        self.decrypted_text.delete("1.0", tk.END)
+
+        # Части дешифруются в фоновом потоке и дописываются в поле по мере готовности
+        def on_results(results):
+            self.decrypted_text.insert(tk.END, ''.join(results))
+
+        self.start_job(CipherJob(decryption_parts(cipher, encrypted_text, original_message_length),
+                                 lambda part: cipher.decrypt(*part)), on_results)
+
+    def encrypt_text(self):
+        """
+        Шифрует текст, вводимый пользователем, используя выбранный алфавит и текущую решетку.
+        """
+        text = self.input_text.get("1.0", tk.END).strip()
+        if not text:
+            messagebox.showerror("Error", "No encrypted text to decrypt!")
+            return
+        if not self.holes:
+            messagebox.showerror("Error", "The grid is empty. No holes selected!")
+            return
+
+        # Выбор алфавита для шифрования
+        self.alphabet_manager.choose_alphabet(text, lambda: AlphabetSelectionDialog(self.master).show())
+        alphabet = self.alphabet_manager.get_alphabet()
+
+        cipher = self.make_cipher()
+        self.max_length = cipher.max_length
+
+        # Количество решеток, на которые делится текст
+        grid_count = -(-len(text) // cipher.max_length)
+
+        if grid_count > 1:
+            messagebox.showinfo("Information", f"Text is too long. It will be divided into {grid_count} grids.")
+
+        self.output_text.delete("1.0", tk.END)
+        self.output_text.insert("1.0", ContainerHeader.for_key(cipher.key, len(text), grid_count).to_text())
+        self.encrypted_viewer.show([], self.grid_rows, self.grid_cols, self.cell_size)
+
+        # Части шифруются в фоновом потоке; готовые решетки сразу появляются в окне
+        def on_results(results):
+            encrypted = ''.join(results)
+            self.encrypted_viewer.append(cipher.split_ciphertext(encrypted))
+            self.output_text.insert(tk.END, encrypted)
+
+        self.start_job(CipherJob(encryption_parts(cipher, text), lambda part: cipher.encrypt(part, alphabet)),
+                       on_results)
+
+    def start_job(self, job, on_results):
+        """
+        Запускает фоновое шифрование или дешифрование и опрос его результатов.
+
+        Параметры:
+        job (CipherJob): Задание, разбитое на части.
+        on_results (callable): Вызывается в потоке интерфейса со списком готовых частей.
+        """
+        self.job = job
+        for button in self.action_buttons:
+            button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress['value'] = 0
+        job.start()
+        self.master.after(POLL_INTERVAL, self.poll_job, job, on_results)
+
+    def poll_job(self, job, on_results):
+        """Переносит готовые части в интерфейс и обновляет индикатор хода работы."""
+        results = job.poll()
+        if results:
+            on_results(results)
+        self.progress['value'] = job.progress
+        if not job.done:
+            self.master.after(POLL_INTERVAL, self.poll_job, job, on_results)
+            return
+
+        self.job = None
+        for button in self.action_buttons:
+            button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        if job.error is not None:
+            messagebox.showerror("Error", str(job.error))
+        elif job.cancelled:
+            messagebox.showinfo("Information", "Operation cancelled. The output is incomplete.")
+
+    def cancel_job(self):
+        """Отменяет текущее фоновое шифрование или дешифрование."""
+        if self.job is not None:
+            self.job.cancel()
+
+
+def main():
+    """Запускает графический интерфейс."""
+    root = tk.Tk()
+    GridCipherApp(root)
+    root.mainloop()
+
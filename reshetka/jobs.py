@@ -0,0 +1,115 @@
+"""
+Фоновое выполнение шифрования и дешифрования по частям с отменой и отчетом о ходе работы.
+
+Модуль не зависит от tkinter: интерфейс периодически вызывает poll() (например, через
+after()) и получает готовые части, пока фоновый поток продолжает работу.
+"""
+import queue
+import threading
+
+# Примерное количество символов, обрабатываемых за одну часть: достаточно мало,
+# чтобы результат и ход работы обновлялись часто, и достаточно много, чтобы
+# накладные расходы на части были незаметны.
+PART_CHARS = 1 << 16
+
+
+def encryption_parts(cipher, text, part_chars=PART_CHARS):
+    """
+    Делит открытый текст на части из целого числа блоков.
+
+    Возвращает:
+    list: Части открытого текста.
+    """
+    size = max(1, part_chars // cipher.max_length) * cipher.max_length
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def decryption_parts(cipher, ciphertext, length, part_chars=PART_CHARS):
+    """
+    Делит шифртекст на части из целого числа блоков вместе с длиной открытого текста каждой части.
+
+    Возвращает:
+    list: Пары (часть шифртекста, длина открытого текста в ней).
+    """
+    blocks = max(1, part_chars // cipher.block_size)
+    size = blocks * cipher.block_size
+    capacity = blocks * cipher.max_length
+    parts = []
+    for start in range(0, len(ciphertext), size):
+        if length <= 0:
+            break
+        parts.append((ciphertext[start:start + size], min(length, capacity)))
+        length -= capacity
+    return parts
+
+
+class CipherJob:
+    """
+    Обрабатывает список частей функцией process в фоновом потоке.
+
+    Результаты складываются в очередь в порядке частей и забираются методом poll()
+    из потока интерфейса. Отмена проверяется между частями.
+    """
+    def __init__(self, parts, process):
+        """
+        Параметры:
+        parts (list): Входные данные частей.
+        process (callable): Функция, обрабатывающая одну часть.
+        """
+        self.parts = parts
+        self.process = process
+        self.total = len(parts)
+        self.completed = 0
+        self.done = False
+        self.cancelled = False
+        self.error = None
+        self._results = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Запускает фоновый поток."""
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Просит фоновый поток остановиться после текущей части."""
+        self._cancel.set()
+
+    @property
+    def progress(self):
+        """Доля обработанных частей (от 0 до 1)."""
+        return self.completed / self.total if self.total else 1.0
+
+    def _run(self):
+        try:
+            for part in self.parts:
+                if self._cancel.is_set():
+                    self._results.put(('cancelled', None))
+                    return
+                self._results.put(('part', self.process(part)))
+        except Exception as error:  # Ошибка передается в поток интерфейса через poll()
+            self._results.put(('error', error))
+            return
+        self._results.put(('done', None))
+
+    def poll(self):
+        """
+        Забирает готовые результаты, не блокируя вызывающий поток.
+
+        Возвращает:
+        list: Результаты частей, готовые с прошлого вызова.
+        """
+        results = []
+        while True:
+            try:
+                kind, value = self._results.get_nowait()
+            except queue.Empty:
+                return results
+            if kind == 'part':
+                results.append(value)
+                self.completed += 1
+            else:
+                self.done = True
+                self.cancelled = kind == 'cancelled'
+                self.error = value
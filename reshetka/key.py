@@ -0,0 +1,525 @@
+"""
+Ключ шифра: размеры решетки и неизменяемый набор дырок.
+
+Двоичный формат ключа (все числа little-endian):
+
+    b'RGK1'           - сигнатура и версия формата
+    flags (uint8)     - 1: после маски записан порядок записи
+    rows, cols        - uint32
+    маска дырок       - ceil(rows * cols / 8) байт, бит i соответствует ячейке i по строкам
+    порядок записи    - необязательно, массив uint32 длины count (uint32) перед ним
+
+Каскад ключей (CascadeKey) записывается как b'RGKC', количество ключей (uint32) и ключи
+по очереди, каждый - длина (uint32) и данные в формате выше.
+"""
+import hashlib
+import json
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from . import metrics
+
+KEY_MAGIC = b'RGK1'
+CASCADE_MAGIC = b'RGKC'
+FLAG_WRITE_ORDER = 1
+_HEADER = struct.Struct('<4sBII')
+_COUNT = struct.Struct('<I')
+
+
+def compile_write_order(grid_rows, grid_cols, holes):
+    """
+    Вычисляет порядок записи: номера ячеек (row * grid_cols + col), в которые по очереди
+    попадают символы открытого текста во всех четырех положениях решетки
+    (исходное, поворот на 180 градусов, отражение по оси X, отражение по оси Y).
+    В каждом положении дырки обходятся по строкам, слева направо. Ячейка, уже занятая
+    в предыдущем положении, повторно не используется.
+
+    Параметры:
+    grid_rows (int): Количество строк решетки.
+    grid_cols (int): Количество столбцов решетки.
+    holes (iterable): Координаты дырок (row, col).
+
+    Возвращает:
+    tuple: Номера ячеек в порядке записи.
+    """
+    # Положения считаются над номерами ячеек: сортировка целых чисел намного быстрее
+    # сортировки кортежей, что заметно на решетках в сотни и тысячи ячеек в стороне.
+    positions = sorted({row * grid_cols + col for row, col in holes})
+    last = grid_rows * grid_cols - 1
+    rotated = [last - position for position in reversed(positions)]
+    reflected_on_x = sorted([(grid_rows - 1 - position // grid_cols) * grid_cols + position % grid_cols
+                             for position in positions])
+    reflected_on_y = sorted([position - position % grid_cols * 2 + grid_cols - 1 for position in positions])
+    return tuple(dict.fromkeys(positions + rotated + reflected_on_x + reflected_on_y))
+
+
+def compose_write_orders(keys):
+    """
+    Объединяет несколько раундов шифрования в один порядок записи.
+
+    Первый раунд - обычное шифрование первым ключом. Каждый следующий раунд переставляет
+    весь блок предыдущего: первые max_length символов ложатся в ячейки по порядку записи
+    ключа, остальные - в его свободные ячейки по строкам. Для ключей, заполняющих всю
+    решетку, это в точности повторное шифрование блока.
+
+    Параметры:
+    keys (sequence): Ключи раундов (GridKey) с одинаковыми размерами решетки.
+
+    Возвращает:
+    tuple: Номера ячеек итогового блока, в которые попадают символы открытого текста.
+    """
+    order = keys[0].write_order
+    for key in keys[1:]:
+        destination = key.write_order + key.free_cells  # обратная перестановка раунда
+        order = [destination[position] for position in order]
+    return tuple(order)
+
+
+def _is_write_order(grid_rows, grid_cols, holes, order):
+    """
+    Проверяет, что order - порядок записи для дырок holes (тот же, что вернет compile_write_order).
+
+    Каждая ячейка порядка получает ранг - номер первого положения решетки, в котором в нее
+    попадает дырка. Порядок верен, если он обходит ровно эти ячейки по возрастанию пар
+    (ранг, номер ячейки): без повторов, сначала дырки по строкам, затем ячейки следующих положений.
+    Проверка линейна и не требует сортировки.
+    """
+    last = grid_rows * grid_cols - 1
+    ranks = {}
+    for row, col in holes:
+        ranks.setdefault(row * grid_cols + col, 0)
+    for row, col in holes:
+        ranks.setdefault(last - row * grid_cols - col, 1)
+    for row, col in holes:
+        ranks.setdefault((grid_rows - 1 - row) * grid_cols + col, 2)
+    for row, col in holes:
+        ranks.setdefault(row * grid_cols + grid_cols - 1 - col, 3)
+    if len(order) != len(ranks):
+        return False
+    previous = (-1, -1)
+    for position in order:
+        rank = ranks.get(position)
+        if rank is None or (rank, position) <= previous:
+            return False
+        previous = (rank, position)
+    return True
+
+
+class GridKey:
+    """
+    Неизменяемый ключ шифра: размеры решетки и множество дырок.
+
+    Ключ хешируется и сравнивается по значению, поэтому его можно использовать как ключ
+    словаря или кэша, передавать между потоками и процессами. Порядок записи символов
+    вычисляется один раз при создании ключа.
+    """
+    __slots__ = ('_rows', '_cols', '_holes', '_write_order', '_hash', '_digest', '_free_cells', '_cell_sources')
+
+    def __init__(self, rows, cols, holes):
+        """
+        Параметры:
+        rows (int): Количество строк решетки.
+        cols (int): Количество столбцов решетки.
+        holes (iterable): Координаты дырок (row, col).
+        """
+        if rows < 1 or cols < 1:
+            raise ValueError(f"Grid size must be positive, got {rows}x{cols}.")
+        holes = frozenset((int(row), int(col)) for row, col in holes)
+        for row, col in holes:
+            if not (0 <= row < rows and 0 <= col < cols):
+                raise ValueError(f"Hole {(row, col)} is outside of the {rows}x{cols} grid.")
+
+        with metrics.stage('key_compilation'):
+            write_order = compile_write_order(rows, cols, holes)
+        self._assign(rows, cols, holes, write_order)
+
+    def _assign(self, rows, cols, holes, write_order):
+        """Заполняет поля ключа (используется конструктором и загрузкой из двоичного формата)."""
+        object.__setattr__(self, '_rows', rows)
+        object.__setattr__(self, '_cols', cols)
+        object.__setattr__(self, '_holes', holes)
+        object.__setattr__(self, '_write_order', write_order)
+        object.__setattr__(self, '_hash', hash((rows, cols, holes)))
+        object.__setattr__(self, '_digest', None)
+        object.__setattr__(self, '_free_cells', None)
+        object.__setattr__(self, '_cell_sources', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GridKey is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("GridKey is immutable")
+
+    def __reduce__(self):
+        return GridKey, (self._rows, self._cols, self.sorted_holes())
+
+    def __eq__(self, other):
+        if not isinstance(other, GridKey):
+            return NotImplemented
+        if type(other) is not type(self):
+            return False
+        return self._rows == other._rows and self._cols == other._cols and self._holes == other._holes
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"GridKey({self._rows}, {self._cols}, {self.sorted_holes()!r})"
+
+    @property
+    def rows(self):
+        """Количество строк решетки."""
+        return self._rows
+
+    @property
+    def cols(self):
+        """Количество столбцов решетки."""
+        return self._cols
+
+    @property
+    def holes(self):
+        """Множество дырок (frozenset координат (row, col))."""
+        return self._holes
+
+    @property
+    def write_order(self):
+        """Номера ячеек (row * cols + col) в порядке записи символов во всех четырех положениях."""
+        return self._write_order
+
+    @property
+    def block_size(self):
+        """Количество ячеек решетки (длина блока шифртекста)."""
+        return self._rows * self._cols
+
+    @property
+    def free_cells(self):
+        """Номера ячеек (по строкам), которые в полностью заполненном блоке занимает заполнение."""
+        if self._free_cells is None:
+            used = set(self._write_order)
+            object.__setattr__(self, '_free_cells',
+                               tuple(position for position in range(self.block_size) if position not in used))
+        return self._free_cells
+
+    @property
+    def cell_sources(self):
+        """
+        Обратная перестановка полного блока: для каждой ячейки (по строкам) - номер символа
+        в строке «max_length символов текста + символы заполнения свободных ячеек по строкам».
+        Позволяет собрать блок шифртекста одной выборкой вместо записи по ячейкам.
+        """
+        if self._cell_sources is None:
+            with metrics.stage('key_compilation'):
+                sources = array('I', bytes(4 * self.block_size))
+                for index, position in enumerate(self._write_order):
+                    sources[position] = index
+                for index, position in enumerate(self.free_cells, len(self._write_order)):
+                    sources[position] = index
+            object.__setattr__(self, '_cell_sources', sources)
+        return self._cell_sources
+
+    def digest(self):
+        """Возвращает SHA-256 двоичного представления ключа (без порядка записи) в шестнадцатеричном виде."""
+        if self._digest is None:
+            object.__setattr__(self, '_digest', hashlib.sha256(self.to_bytes()).hexdigest())
+        return self._digest
+
+    def sorted_holes(self):
+        """Возвращает дырки списком, отсортированным по строкам, слева направо."""
+        return sorted(self._holes)
+
+    @classmethod
+    def random(cls, rows, cols, count=None, rng=None):
+        """
+        Генерирует случайный ключ без перекрытий (см. orbits.random_holes).
+
+        Параметры:
+        rows (int): Количество строк решетки.
+        cols (int): Количество столбцов решетки.
+        count (int): Количество дырок. По умолчанию - максимально возможное.
+        rng (random.Random): Генератор случайных чисел. По умолчанию - random.SystemRandom.
+        """
+        from .orbits import random_holes
+        return cls(rows, cols, random_holes(rows, cols, count, rng))
+
+    def to_dict(self):
+        """Возвращает ключ в виде словаря для сохранения в JSON."""
+        return {'rows': self._rows, 'cols': self._cols, 'holes': [list(hole) for hole in self.sorted_holes()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Создает ключ (или каскад ключей) из словаря, полученного из to_dict."""
+        try:
+            if 'cascade' in data:
+                return CascadeKey([GridKey.from_dict(item) for item in data['cascade']])
+            return cls(data['rows'], data['cols'], data['holes'])
+        except (KeyError, TypeError) as error:
+            raise ValueError(f"Invalid key data: {error}") from None
+
+    def to_bytes(self, include_order=False):
+        """
+        Возвращает ключ в компактном двоичном формате.
+
+        Параметры:
+        include_order (bool): Добавить вычисленный порядок записи, чтобы загрузка не пересчитывала его.
+        """
+        mask = bytearray((self.block_size + 7) // 8)
+        for row, col in self._holes:
+            position = row * self._cols + col
+            mask[position >> 3] |= 1 << (position & 7)
+        parts = [_HEADER.pack(KEY_MAGIC, FLAG_WRITE_ORDER if include_order else 0, self._rows, self._cols), mask]
+        if include_order:
+            order = array('I', self._write_order)
+            if sys.byteorder == 'big':
+                order.byteswap()
+            parts += [_COUNT.pack(len(order)), order.tobytes()]
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Создает ключ из двоичного представления, полученного из to_bytes."""
+        data = memoryview(data)
+        if len(data) < _HEADER.size:
+            raise ValueError("Invalid key data: too short.")
+        magic, flags, rows, cols = _HEADER.unpack_from(data)
+        if magic != KEY_MAGIC:
+            raise ValueError("Invalid key data: bad signature.")
+        if rows < 1 or cols < 1:
+            raise ValueError(f"Grid size must be positive, got {rows}x{cols}.")
+        mask_end = _HEADER.size + (rows * cols + 7) // 8
+        if len(data) < mask_end:
+            raise ValueError("Invalid key data: truncated hole mask.")
+
+        holes = []
+        for index, byte in enumerate(data[_HEADER.size:mask_end]):
+            while byte:
+                low = byte & -byte
+                position = index * 8 + low.bit_length() - 1
+                if position >= rows * cols:
+                    raise ValueError("Invalid key data: hole outside of the grid.")
+                holes.append(divmod(position, cols))
+                byte ^= low
+        holes = frozenset(holes)
+
+        if not flags & FLAG_WRITE_ORDER:
+            return cls(rows, cols, holes)
+
+        if len(data) < mask_end + _COUNT.size:
+            raise ValueError("Invalid key data: truncated write order.")
+        (count,) = _COUNT.unpack_from(data, mask_end)
+        order_start = mask_end + _COUNT.size
+        if len(data) < order_start + 4 * count:
+            raise ValueError("Invalid key data: truncated write order.")
+        order = array('I')
+        order.frombytes(data[order_start:order_start + 4 * count])
+        if sys.byteorder == 'big':
+            order.byteswap()
+        # Порядок из данных не должен расходиться с маской: иначе ключ, равный верному и
+        # с тем же дайджестом, молча терял бы символы текста
+        if count > 4 * len(holes) or not _is_write_order(rows, cols, holes, order):
+            raise ValueError("Invalid key data: write order does not match the hole mask.")
+        key = cls.__new__(cls)
+        key._assign(rows, cols, holes, tuple(order))
+        return key
+
+
+class CascadeKey(GridKey):
+    """
+    Несколько ключей одного размера, применяемых по очереди, как один ключ.
+
+    Перестановки раундов объединяются в один порядок записи (compose_write_orders) при
+    создании каскада, поэтому любой шифратор (GridCipher, VectorizedGridCipher,
+    ByteGridCipher) с каскадом из N ключей работает так же быстро, как с одним ключом.
+    """
+    __slots__ = ('_keys',)
+
+    def __init__(self, keys):
+        """
+        Параметры:
+        keys (iterable): Ключи раундов (GridKey или CascadeKey) в порядке шифрования.
+        """
+        flat = []
+        for key in keys:
+            if not isinstance(key, GridKey):
+                raise TypeError(f"Expected GridKey, got {type(key).__name__}")
+            flat.extend(key.keys if isinstance(key, CascadeKey) else (key,))
+        if not flat:
+            raise ValueError("A cascade needs at least one key.")
+        rows, cols = flat[0].rows, flat[0].cols
+        for key in flat[1:]:
+            if (key.rows, key.cols) != (rows, cols):
+                raise ValueError(f"All cascade keys must have the same grid size: "
+                                 f"{rows}x{cols} and {key.rows}x{key.cols}.")
+
+        with metrics.stage('key_compilation'):
+            write_order = compose_write_orders(flat)
+        self._assign(rows, cols, flat[0].holes, write_order)
+        object.__setattr__(self, '_keys', tuple(flat))
+        object.__setattr__(self, '_hash', hash(self._keys))
+
+    def __reduce__(self):
+        return CascadeKey, (self._keys,)
+
+    def __eq__(self, other):
+        if not isinstance(other, GridKey):
+            return NotImplemented
+        return isinstance(other, CascadeKey) and self._keys == other._keys
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"CascadeKey({list(self._keys)!r})"
+
+    @property
+    def keys(self):
+        """Ключи раундов в порядке шифрования."""
+        return self._keys
+
+    def to_dict(self):
+        """Возвращает каскад в виде словаря для сохранения в JSON."""
+        return {'cascade': [key.to_dict() for key in self._keys]}
+
+    def to_bytes(self, include_order=False):
+        """Возвращает каскад в двоичном формате: ключи раундов по очереди."""
+        parts = [CASCADE_MAGIC, _COUNT.pack(len(self._keys))]
+        for key in self._keys:
+            data = key.to_bytes(include_order)
+            parts += [_COUNT.pack(len(data)), data]
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Создает каскад из двоичного представления, полученного из to_bytes."""
+        data = memoryview(data)
+        if len(data) < len(CASCADE_MAGIC) + _COUNT.size or bytes(data[:len(CASCADE_MAGIC)]) != CASCADE_MAGIC:
+            raise ValueError("Invalid key data: bad signature.")
+        (count,) = _COUNT.unpack_from(data, len(CASCADE_MAGIC))
+        offset = len(CASCADE_MAGIC) + _COUNT.size
+        keys = []
+        for _ in range(count):
+            if len(data) < offset + _COUNT.size:
+                raise ValueError("Invalid key data: truncated cascade.")
+            (size,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            if len(data) < offset + size:
+                raise ValueError("Invalid key data: truncated cascade.")
+            keys.append(GridKey.from_bytes(data[offset:offset + size]))
+            offset += size
+        return cls(keys)
+
+
+class KeyCache:
+    """
+    Потокобезопасный LRU-кэш ключей по их дайджесту.
+
+    Повторная загрузка того же ключа (например, ключа клиента в сервисе) возвращает
+    уже скомпилированный GridKey без разбора данных и пересчета порядка записи.
+    """
+    def __init__(self, maxsize=128):
+        """
+        Параметры:
+        maxsize (int): Максимальное количество ключей в кэше.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get(self, digest):
+        """Возвращает ключ по дайджесту или None."""
+        with self._lock:
+            key = self._keys.get(digest)
+            if key is None:
+                self.misses += 1
+                return None
+            self._keys.move_to_end(digest)
+            self.hits += 1
+            return key
+
+    def add(self, key):
+        """Добавляет ключ в кэш и возвращает ключ, который теперь хранится в кэше."""
+        digest = key.digest()
+        with self._lock:
+            key = self._keys.setdefault(digest, key)
+            self._keys.move_to_end(digest)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+            return key
+
+    def from_bytes(self, data):
+        """
+        Загружает ключ из двоичного представления через кэш.
+
+        Параметры:
+        data (bytes): Данные в формате GridKey.to_bytes или CascadeKey.to_bytes.
+
+        Возвращает:
+        GridKey: Ключ из кэша или только что загруженный.
+        """
+        data = bytes(data)
+        if data.startswith(CASCADE_MAGIC):
+            # Дайджест каскада считается по ключам раундов, поэтому каскад сначала разбирается
+            return self.add(CascadeKey.from_bytes(data))
+        if len(data) < _HEADER.size or data[:4] != KEY_MAGIC:
+            raise ValueError("Invalid key data: bad signature.")
+        rows, cols = _HEADER.unpack_from(data)[2:]
+        # Дайджест считается по данным без порядка записи, как в GridKey.digest
+        canonical = _HEADER.pack(KEY_MAGIC, 0, rows, cols) + data[_HEADER.size:_HEADER.size + (rows * cols + 7) // 8]
+        key = self.get(hashlib.sha256(canonical).hexdigest())
+        if key is None:
+            key = self.add(GridKey.from_bytes(data))
+        return key
+
+    def clear(self):
+        """Очищает кэш."""
+        with self._lock:
+            self._keys.clear()
+
+
+def save_key(key, path, include_order=False):
+    """
+    Сохраняет ключ в файл. Файлы с расширением .rgk записываются в двоичном формате,
+    остальные - в JSON.
+
+    Параметры:
+    key (GridKey): Ключ.
+    path (str): Путь к файлу.
+    include_order (bool): Сохранить в двоичном файле и порядок записи.
+    """
+    if str(path).endswith('.rgk'):
+        with open(path, 'wb') as file:
+            file.write(key.to_bytes(include_order))
+        return
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(key.to_dict(), file)
+
+
+def load_key(path):
+    """
+    Загружает ключ из файла в двоичном формате или JSON (формат определяется по содержимому).
+
+    Параметры:
+    path (str): Путь к файлу.
+
+    Возвращает:
+    GridKey: Загруженный ключ.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data.startswith((KEY_MAGIC, CASCADE_MAGIC)):
+        return key_from_bytes(data)
+    return GridKey.from_dict(json.loads(data.decode('utf-8')))
+
+
+def key_from_bytes(data):
+    """Создает ключ или каскад ключей из двоичного представления (формат определяется по сигнатуре)."""
+    if bytes(data[:len(CASCADE_MAGIC)]) == CASCADE_MAGIC:
+        return CascadeKey.from_bytes(data)
+    return GridKey.from_bytes(data)
@@ -0,0 +1,177 @@
+"""
+Замеры времени по этапам шифрования и счетчики обработанных данных.
+
+Сбор включается только на время блока with:
+
+    with Metrics(profile=True) as metrics:
+        cipher.encrypt(text)
+    print(metrics.to_json())
+
+Вне такого блока функции stage() и count() сводятся к проверке одной глобальной
+переменной, поэтому замеры в горячих участках ничего не стоят, пока они выключены.
+Этапы могут быть вложенными: для каждого этапа сохраняется полное время и собственное
+время без вложенных этапов. Замеры собираются в текущем процессе; рабочие процессы
+ParallelGridCipher и пакетного режима командной строки в них не попадают.
+"""
+import contextlib
+import json
+import threading
+import time
+
+# Активный сборщик; None - замеры выключены
+_active = None
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def active():
+    """Возвращает активный сборщик или None."""
+    return _active
+
+
+def stage(name):
+    """Возвращает контекст замера этапа name; без активного сборщика он ничего не делает."""
+    recorder = _active
+    return recorder.stage(name) if recorder is not None else _NULL_STAGE
+
+
+def count(name, value=1):
+    """Увеличивает счетчик name активного сборщика, если он есть."""
+    recorder = _active
+    if recorder is not None:
+        recorder.count(name, value)
+
+
+class Metrics:
+    """
+    Сборщик замеров: таймеры этапов, счетчики и (по желанию) профиль cProfile
+    и пик памяти tracemalloc.
+    """
+    def __init__(self, profile=False, trace_memory=False, profile_limit=25):
+        """
+        Параметры:
+        profile (bool): Профилировать выполнение cProfile на время сбора.
+        trace_memory (bool): Отслеживать выделение памяти tracemalloc на время сбора.
+        profile_limit (int): Сколько самых затратных функций профиля сохранять.
+        """
+        self.timers = {}  # имя этапа -> [вызовы, полное время, собственное время]
+        self.counters = {}
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_limit = profile_limit
+        self.profile_stats = None
+        self.memory = None
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._previous = None
+        self._profiler = None
+        self._started = None
+        self._started_tracing = False
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Замеряет время выполнения блока with как этап name."""
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(0.0)  # время вложенных этапов
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                timer = self.timers.setdefault(name, [0, 0.0, 0.0])
+                timer[0] += 1
+                timer[1] += elapsed
+                timer[2] += elapsed - nested
+
+    def count(self, name, value=1):
+        """Увеличивает счетчик name на value."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        """Сбрасывает таймеры и счетчики."""
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+
+    def __enter__(self):
+        global _active
+        self._previous = _active
+        _active = self
+        if self.trace_memory:
+            # cProfile, pstats и tracemalloc загружаются, только когда они включены:
+            # импорт пакета не должен за них платить
+            import tracemalloc
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        if self.profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        global _active
+        self.elapsed += time.perf_counter() - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.profile_stats = self._format_profile(self._profiler)
+            self._profiler = None
+        if self.trace_memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory = {'current_bytes': current, 'peak_bytes': peak}
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        _active = self._previous
+
+    def _format_profile(self, profiler):
+        """Возвращает самые затратные функции профиля по суммарному времени."""
+        import io
+        import pstats
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        rows = []
+        for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({'function': f"{filename}:{line}({function})", 'calls': calls,
+                         'own_seconds': own, 'cumulative_seconds': cumulative})
+        rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+        return rows[:self.profile_limit]
+
+    def to_dict(self):
+        """
+        Возвращает замеры в виде словаря, пригодного для JSON.
+
+        Возвращает:
+        dict: elapsed, stages (calls, seconds, self_seconds), counters и, если включены,
+            profile и memory.
+        """
+        with self._lock:
+            result = {
+                'elapsed': self.elapsed,
+                'stages': {name: {'calls': calls, 'seconds': total, 'self_seconds': own}
+                           for name, (calls, total, own) in sorted(self.timers.items())},
+                'counters': dict(sorted(self.counters.items())),
+            }
+        if self.profile_stats is not None:
+            result['profile'] = self.profile_stats
+        if self.memory is not None:
+            result['memory'] = self.memory
+        return result
+
+    def to_json(self, indent=2):
+        """Возвращает замеры в формате JSON."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def save(self, path):
+        """Записывает замеры в JSON-файл."""
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.to_json())
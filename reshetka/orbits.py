@@ -0,0 +1,146 @@
+"""
+Орбиты ячеек решетки под действием четырех положений (исходное, поворот на 180 градусов,
+отражения по осям X и Y).
+
+Дырка в ячейке за четыре положения проходит всю орбиту этой ячейки, поэтому две дырки
+перекрываются тогда и только тогда, когда лежат в одной орбите. Ячейки средней строки
+или среднего столбца при нечетных размерах имеют вырожденную орбиту (меньше четырех
+ячеек) и дыркой быть не могут: дырка перекрылась бы сама с собой.
+"""
+import random
+
+
+def cell_orbit(row, col, rows, cols):
+    """
+    Возвращает орбиту ячейки: множество ее образов во всех четырех положениях.
+
+    Параметры:
+    row (int): Строка ячейки.
+    col (int): Колонка ячейки.
+    rows (int): Количество строк решетки.
+    cols (int): Количество столбцов решетки.
+    """
+    return {(row, col), (rows - 1 - row, cols - 1 - col), (rows - 1 - row, col), (row, cols - 1 - col)}
+
+
+def is_degenerate(row, col, rows, cols):
+    """Проверяет, что ячейка лежит на средней строке или среднем столбце (орбита меньше 4 ячеек)."""
+    return row == rows - 1 - row or col == cols - 1 - col
+
+
+def orbit_index(row, col, rows, cols):
+    """Возвращает номер орбиты ячейки: номер ее представителя в левой верхней четверти решетки."""
+    return min(row, rows - 1 - row) * ((cols + 1) // 2) + min(col, cols - 1 - col)
+
+
+def orbit_count(rows, cols):
+    """Количество орбит решетки, включая вырожденные."""
+    return ((rows + 1) // 2) * ((cols + 1) // 2)
+
+
+def full_orbit_count(rows, cols):
+    """Количество невырожденных орбит, то есть максимальное число дырок в ключе."""
+    return (rows // 2) * (cols // 2)
+
+
+def list_orbits(rows, cols):
+    """
+    Перечисляет все орбиты решетки, включая вырожденные орбиты средней строки и
+    среднего столбца при нечетных размерах.
+
+    Возвращает:
+    list: Орбиты в порядке номеров (orbit_index); каждая - отсортированный кортеж ячеек.
+    """
+    return [tuple(sorted(cell_orbit(row, col, rows, cols)))
+            for row in range((rows + 1) // 2) for col in range((cols + 1) // 2)]
+
+
+def random_holes(rows, cols, count=None, rng=None):
+    """
+    Генерирует дырки ключа: по одному случайному представителю в случайно выбранных
+    невырожденных орбитах. Работает за один проход по орбитам, без повторных попыток,
+    и всегда возвращает ровно count дырок.
+
+    Параметры:
+    rows (int): Количество строк решетки.
+    cols (int): Количество столбцов решетки.
+    count (int): Количество дырок. По умолчанию - максимальное (full_orbit_count).
+    rng (random.Random): Генератор случайных чисел. По умолчанию - random.SystemRandom.
+
+    Возвращает:
+    list: Дырки (row, col), отсортированные по строкам.
+    """
+    rng = rng if rng is not None else random.SystemRandom()
+    half_rows, half_cols = rows // 2, cols // 2
+    total = half_rows * half_cols
+    if count is None:
+        count = total
+    if not 0 <= count <= total:
+        raise ValueError(f"A {rows}x{cols} grid holds at most {total} holes, got {count}.")
+
+    # Невырожденные орбиты - это ячейки (row, col) с row < rows // 2 и col < cols // 2
+    # вместе с их образами; выбор образа кодируется двумя младшими битами случайного байта.
+    orbits = range(total) if count == total else rng.sample(range(total), count)
+    choices = rng.randbytes(count)
+    holes = []
+    for orbit, choice in zip(orbits, choices):
+        row, col = divmod(orbit, half_cols)
+        if choice & 1:
+            row = rows - 1 - row
+        if choice & 2:
+            col = cols - 1 - col
+        holes.append((row, col))
+    holes.sort()
+    return holes
+
+
+class OccupancyMap:
+    """
+    Карта занятости орбит: для каждой орбиты хранится, есть ли в ней дырка.
+
+    Добавление, удаление и проверка перекрытия выполняются за O(1) и не зависят
+    от количества уже выбранных дырок.
+    """
+    def __init__(self, rows, cols, holes=()):
+        """
+        Параметры:
+        rows (int): Количество строк решетки.
+        cols (int): Количество столбцов решетки.
+        holes (iterable): Уже выбранные дырки (row, col).
+        """
+        self.rows = rows
+        self.cols = cols
+        self.occupied = bytearray(orbit_count(rows, cols))
+        for row, col in holes:
+            self.add(row, col)
+
+    def overlaps(self, row, col):
+        """
+        Проверяет, перекроется ли дырка в ячейке с уже выбранными дырками
+        на любом этапе поворота или отражения решетки.
+
+        Возвращает:
+        bool: True, если ячейка вырождена или ее орбита уже занята.
+        """
+        return is_degenerate(row, col, self.rows, self.cols) or \
+            bool(self.occupied[orbit_index(row, col, self.rows, self.cols)])
+
+    def add(self, row, col):
+        """
+        Отмечает орбиту ячейки занятой.
+
+        Возвращает:
+        bool: True, если дырка добавлена, False, если она перекрывается с существующими.
+        """
+        if self.overlaps(row, col):
+            return False
+        self.occupied[orbit_index(row, col, self.rows, self.cols)] = 1
+        return True
+
+    def remove(self, row, col):
+        """Освобождает орбиту ячейки."""
+        self.occupied[orbit_index(row, col, self.rows, self.cols)] = 0
+
+    def clear(self):
+        """Освобождает все орбиты."""
+        self.occupied = bytearray(len(self.occupied))
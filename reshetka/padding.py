@@ -0,0 +1,115 @@
+"""
+Генерация символов заполнения свободных ячеек.
+
+Случайные байты берутся большими порциями из os.urandom (или из переданного генератора,
+например random.Random(seed).randbytes для воспроизводимых тестов) и переводятся в символы
+алфавита одной операцией bytes.translate. Байты, которые дали бы смещение при взятии
+остатка (не меньше 256 - 256 % len(alphabet)), отбрасываются той же операцией, поэтому
+все символы алфавита равновероятны. Символы готовятся впрок, и заполнение блока - это
+один срез из буфера.
+"""
+import os
+from array import array
+
+from . import metrics
+
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+
+class PaddingSource:
+    """
+    Буферизованный источник случайных символов алфавита.
+
+    Для строкового алфавита возвращает строки, для байтового (bytes) - байты.
+    """
+    def __init__(self, alphabet, random_bytes=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        Параметры:
+        alphabet (str | list | Alphabet | bytes): Символы заполнения.
+        random_bytes (callable): Функция n -> n случайных байтов. По умолчанию - os.urandom.
+        buffer_size (int): Сколько символов готовить впрок за одно обращение к генератору.
+        """
+        self.binary = isinstance(alphabet, (bytes, bytearray, memoryview))
+        self.symbols = bytes(alphabet) if self.binary else ''.join(alphabet)
+        if not self.symbols:
+            raise ValueError("An alphabet needs at least one character.")
+        self.random_bytes = random_bytes if random_bytes is not None else os.urandom
+        self.buffer_size = buffer_size
+        self._buffer = self.symbols[:0]
+        self._offset = 0
+
+        size = len(self.symbols)
+        if size > 256:
+            self._draw = self._draw_wide
+            self._limit = 65536 - 65536 % size
+            return
+
+        # Таблицы перевода байта в символ; байты не меньше limit удаляются
+        self._limit = 256 - 256 % size
+        self._reject = bytes(range(self._limit, 256))
+        if self.binary:
+            self._tables = (bytes(self.symbols[value % size] for value in range(256)),)
+            self._draw = self._draw_bytes
+        elif all(ord(char) < 256 for char in self.symbols):
+            self._tables = (bytes(ord(self.symbols[value % size]) for value in range(256)),)
+            self._draw = self._draw_latin1
+        elif all(ord(char) < 0xD800 or 0xE000 <= ord(char) < 0x10000 for char in self.symbols):
+            # Символ из базовой плоскости Unicode - ровно два байта UTF-16: младший и старший
+            # байты получаются двумя переводами одних и тех же случайных байтов.
+            units = [char.encode('utf-16-le') for char in self.symbols]
+            self._tables = tuple(bytes(units[value % size][part] for value in range(256)) for part in (0, 1))
+            self._draw = self._draw_utf16
+        else:
+            self._index = bytes(value % size for value in range(256))
+            self._draw = self._draw_mapped
+
+    def _accepted(self, count):
+        """Возвращает случайные байты, из которых получится примерно count символов."""
+        return self.random_bytes(count * 256 // self._limit + 16)
+
+    def _draw_bytes(self, count):
+        return self._accepted(count).translate(self._tables[0], self._reject)
+
+    def _draw_latin1(self, count):
+        return self._draw_bytes(count).decode('latin-1')
+
+    def _draw_utf16(self, count):
+        data = self._accepted(count)
+        low = data.translate(self._tables[0], self._reject)
+        units = bytearray(2 * len(low))
+        units[0::2] = low
+        units[1::2] = data.translate(self._tables[1], self._reject)
+        return units.decode('utf-16-le')
+
+    def _draw_mapped(self, count):
+        indices = self._accepted(count).translate(self._index, self._reject)
+        return ''.join(map(self.symbols.__getitem__, indices))
+
+    def _draw_wide(self, count):
+        values = array('H')
+        values.frombytes(self.random_bytes(2 * (count * 65536 // self._limit + 16)))
+        size = len(self.symbols)
+        chosen = [self.symbols[value % size] for value in values if value < self._limit]
+        return bytes(chosen) if self.binary else ''.join(chosen)
+
+    def take(self, count):
+        """
+        Возвращает count случайных символов алфавита.
+
+        Возвращает:
+        str | bytes: Символы заполнения.
+        """
+        available = len(self._buffer) - self._offset
+        if count > available:
+            # Замер только при пополнении буфера: срез из готового буфера ничего не стоит
+            with metrics.stage('padding'):
+                parts = [self._buffer[self._offset:]]
+                while available < max(count, self.buffer_size):
+                    drawn = self._draw(max(count, self.buffer_size) - available)
+                    parts.append(drawn)
+                    available += len(drawn)
+                self._buffer = self.symbols[:0].join(parts)
+                self._offset = 0
+        chunk = self._buffer[self._offset:self._offset + count]
+        self._offset += count
+        return chunk
@@ -0,0 +1,126 @@
+"""
+Параллельное шифрование больших текстов в нескольких процессах.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import GridCipher
+
+DEFAULT_CHUNK_BLOCKS = 4096
+
+# Шифратор рабочего процесса. Ключ передается один раз при запуске процесса,
+# а не с каждой частью текста.
+_worker_cipher = None
+
+
+def _init_worker(key, cipher_class):
+    """Создает шифратор в рабочем процессе."""
+    global _worker_cipher
+    _worker_cipher = cipher_class(key)
+
+
+def _encrypt_chunk(text, alphabet):
+    """Шифрует часть текста в рабочем процессе."""
+    return _worker_cipher.encrypt(text, alphabet)
+
+
+def _decrypt_chunk(ciphertext, length):
+    """Дешифрует часть шифртекста в рабочем процессе."""
+    return _worker_cipher.decrypt(ciphertext, length)
+
+
+class ParallelGridCipher(GridCipher):
+    """
+    Шифр поворачивающейся решетки, распределяющий блоки большого текста по процессам.
+
+    При фиксированном ключе блоки независимы, поэтому текст делится на части
+    по chunk_blocks блоков, части обрабатываются в пуле процессов, а результаты
+    собираются в исходном порядке. Тексты меньше двух частей шифруются в текущем процессе.
+    """
+    def __init__(self, key, alphabet=None, rng=None, workers=None, chunk_blocks=DEFAULT_CHUNK_BLOCKS,
+                 cipher_class=GridCipher):
+        """
+        Параметры:
+        key (GridKey): Ключ - размеры решетки и набор дырок.
+        alphabet (list): Алфавит для случайных символов. Если не задан, выбирается по тексту.
+        rng (random.Random): Генератор случайных чисел для шифрования в текущем процессе.
+        workers (int): Количество процессов. По умолчанию - число процессоров.
+        chunk_blocks (int): Сколько блоков отправлять в процесс за одно задание.
+        cipher_class (type): Шифратор рабочих процессов (GridCipher или VectorizedGridCipher).
+        """
+        super().__init__(key, alphabet, rng)
+        if chunk_blocks < 1:
+            raise ValueError("chunk_blocks must be positive")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_blocks = chunk_blocks
+        self.cipher_class = cipher_class
+        self._local = cipher_class(key, alphabet, self.rng)
+        self._executor = None
+
+    def _pool(self):
+        """Возвращает пул процессов, создавая его при первом обращении."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.key, self.cipher_class))
+        return self._executor
+
+    def close(self):
+        """Останавливает рабочие процессы."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def encrypt(self, text, alphabet=None):
+        """
+        Шифрует текст, распределяя части по процессам.
+
+        Параметры:
+        text (str): Открытый текст.
+        alphabet (list): Алфавит для случайных символов. По умолчанию - алфавит шифратора
+            или определенный по тексту.
+
+        Возвращает:
+        str: Шифртекст длиной, кратной rows * cols.
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        if alphabet is None:
+            alphabet = self.resolve_alphabet(text)
+
+        chunk_size = self.max_length * self.chunk_blocks
+        if len(text) < 2 * chunk_size or self.workers == 1:
+            return self._local.encrypt(text, alphabet)
+
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        return ''.join(self._pool().map(_encrypt_chunk, chunks, [alphabet] * len(chunks)))
+
+    def decrypt(self, ciphertext, length):
+        """
+        Дешифрует шифртекст, распределяя части по процессам.
+
+        Параметры:
+        ciphertext (str): Шифртекст.
+        length (int): Длина исходного сообщения.
+
+        Возвращает:
+        str: Открытый текст длиной не более length.
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+
+        chunk_size = self.block_size * self.chunk_blocks
+        needed_blocks = -(-max(length, 0) // self.max_length)
+        ciphertext = ciphertext[:needed_blocks * self.block_size]
+        if len(ciphertext) < 2 * chunk_size or self.workers == 1:
+            return self._local.decrypt(ciphertext, length)
+
+        chunks = [ciphertext[i:i + chunk_size] for i in range(0, len(ciphertext), chunk_size)]
+        lengths = [self.max_length * self.chunk_blocks] * len(chunks)
+        lengths[-1] = length - self.max_length * self.chunk_blocks * (len(chunks) - 1)
+        return ''.join(self._pool().map(_decrypt_chunk, chunks, lengths))
@@ -0,0 +1,605 @@
+"""
+Локальный сервис шифрования на asyncio: Unix-сокет или порт на localhost.
+
+Запросы и ответы передаются кадрами (все числа little-endian, строки - UTF-8):
+
+    длина (uint32)           - длина остальной части кадра
+    номер запроса (uint32)   - возвращается в ответе
+    операция / статус (uint8)
+    данные
+
+Операции:
+
+    OP_KEY            ключ (GridKey.to_bytes без порядка записи)     -> SHA-256 ключа (32 байта)
+    OP_ENCRYPT        дайджест + текст                               -> шифртекст
+    OP_DECRYPT        дайджест + длина (uint64) + шифртекст          -> открытый текст
+    OP_ENCRYPT_MANY   дайджест + список строк                        -> список шифртекстов
+    OP_DECRYPT_MANY   дайджест + количество (uint32) + длины (uint64) + список строк -> список
+
+Список строк - количество (uint32), затем для каждой строки длина в байтах (uint32) и байты.
+Ответ со статусом STATUS_ERROR содержит текст ошибки. Статус STATUS_UNKNOWN_KEY означает, что
+ключа с таким дайджестом у сервиса нет (например, он вытеснен из кэша): клиент передает ключ
+заново и повторяет запрос.
+
+Ключ передается один раз, после чего сервис держит скомпилированный шифратор и запросы
+ссылаются на ключ по дайджесту. Дайджест не покрывает порядок записи, поэтому клиент его
+не передает, а присланный порядок принимается, только если совпадает с вычисленным по маске
+(см. GridKey.from_bytes): иначе порядок одного клиента достался бы всем остальным.
+
+Запросы одного соединения можно отправлять, не дожидаясь ответов: ответы приходят
+по мере готовности с номером запроса. Небольшие запросы выполняются прямо в цикле
+событий, крупные - в пуле процессов. На каждом соединении в работе не больше
+max_inflight запросов: пока они не завершены, следующие кадры не читаются, и клиент
+упирается в заполненный буфер сокета.
+
+Примеры:
+    python -m reshetka.service serve --unix /tmp/reshetka.sock
+    python -m reshetka.service load --unix /tmp/reshetka.sock --key key.json --connections 16
+    python -m reshetka.service load --key key.json --requests 100000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import metrics
+from .batch import cipher_for
+from .engine import GridCipher
+from .key import GridKey, KeyCache, key_from_bytes, load_key
+
+OP_KEY = 1
+OP_ENCRYPT = 2
+OP_DECRYPT = 3
+OP_ENCRYPT_MANY = 4
+OP_DECRYPT_MANY = 5
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_UNKNOWN_KEY = 2
+
+DIGEST_SIZE = 32
+DEFAULT_MAX_INFLIGHT = 64
+DEFAULT_OFFLOAD_BYTES = 1 << 16  # Запросы крупнее выполняются в пуле процессов
+DEFAULT_MAX_FRAME = 1 << 26
+DEFAULT_CACHE_SIZE = 128
+
+_LENGTH = struct.Struct('<I')
+_FRAME = struct.Struct('<IB')
+_COUNT = struct.Struct('<I')
+_TEXT_LENGTH = struct.Struct('<Q')
+_ENCODING = 'utf-8'
+
+# Шифраторы рабочего процесса по дайджесту ключа
+_worker_ciphers = {}
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceError(ValueError):
+    """Ошибка, которую сервис вернул в ответ на запрос."""
+
+
+class UnknownKeyError(ServiceError):
+    """Ключа с дайджестом из запроса нет в кэше сервиса."""
+
+
+def pack_strings(strings):
+    """Упаковывает список строк: количество, затем длина и байты каждой строки."""
+    parts = [_COUNT.pack(len(strings))]
+    for string in strings:
+        data = string.encode(_ENCODING)
+        parts += (_COUNT.pack(len(data)), data)
+    return b''.join(parts)
+
+
+def unpack_strings(data, offset=0):
+    """Разбирает список строк, упакованный pack_strings, начиная со смещения offset."""
+    try:
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        strings = []
+        for _ in range(count):
+            (size,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            if offset + size > len(data):
+                raise ValueError("Truncated string list.")
+            strings.append(bytes(data[offset:offset + size]).decode(_ENCODING))
+            offset += size
+    except struct.error:
+        raise ValueError("Truncated string list.") from None
+    return strings
+
+
+def execute(cipher, op, data):
+    """
+    Выполняет операцию над данными запроса (без дайджеста ключа).
+
+    Параметры:
+    cipher (GridCipher): Шифратор ключа запроса.
+    op (int): Операция (OP_ENCRYPT, OP_DECRYPT, OP_ENCRYPT_MANY, OP_DECRYPT_MANY).
+    data (bytes): Данные запроса после дайджеста.
+
+    Возвращает:
+    bytes: Данные ответа.
+    """
+    if op == OP_ENCRYPT:
+        return cipher.encrypt(data.decode(_ENCODING)).encode(_ENCODING)
+    if op == OP_DECRYPT:
+        if len(data) < _TEXT_LENGTH.size:
+            raise ValueError("Missing plaintext length.")
+        (length,) = _TEXT_LENGTH.unpack_from(data)
+        return cipher.decrypt(data[_TEXT_LENGTH.size:].decode(_ENCODING), length).encode(_ENCODING)
+    if op == OP_ENCRYPT_MANY:
+        return pack_strings(cipher.encrypt_many(unpack_strings(data)))
+    if op == OP_DECRYPT_MANY:
+        try:
+            (count,) = _COUNT.unpack_from(data)
+            lengths = struct.unpack_from(f'<{count}Q', data, _COUNT.size)
+        except struct.error:
+            raise ValueError("Truncated length list.") from None
+        ciphertexts = unpack_strings(data, _COUNT.size + _TEXT_LENGTH.size * count)
+        if len(ciphertexts) != count:
+            raise ValueError(f"Expected {count} ciphertexts, got {len(ciphertexts)}.")
+        return pack_strings(cipher.decrypt_many(ciphertexts, lengths))
+    raise ValueError(f"Unknown operation: {op}.")
+
+
+def _execute_in_worker(digest, key_data, op, data):
+    """Выполняет запрос в рабочем процессе; шифратор ключа создается один раз на процесс."""
+    cipher = _worker_ciphers.get(digest)
+    if cipher is None:
+        if len(_worker_ciphers) >= DEFAULT_CACHE_SIZE:
+            _worker_ciphers.clear()
+        cipher = _worker_ciphers[digest] = GridCipher(key_from_bytes(key_data))
+    return execute(cipher, op, data)
+
+
+class CipherServer:
+    """
+    Сервер шифрования: держит скомпилированные ключи и обслуживает соединения
+    с конвейерной обработкой запросов.
+    """
+    def __init__(self, max_inflight=DEFAULT_MAX_INFLIGHT, offload_bytes=DEFAULT_OFFLOAD_BYTES, workers=None,
+                 executor=None, cache_size=DEFAULT_CACHE_SIZE, max_frame=DEFAULT_MAX_FRAME):
+        """
+        Параметры:
+        max_inflight (int): Сколько запросов одного соединения выполнять одновременно.
+        offload_bytes (int): Запросы с данными не меньше этого размера выполняются в пуле.
+        workers (int): Количество процессов пула. По умолчанию - число процессоров.
+        executor (concurrent.futures.Executor): Готовый пул вместо собственного.
+        cache_size (int): Сколько ключей держать скомпилированными.
+        max_frame (int): Наибольший допустимый размер кадра в байтах.
+        """
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be positive")
+        self.max_inflight = max_inflight
+        self.offload_bytes = offload_bytes
+        self.workers = workers
+        self.cache_size = cache_size
+        self.max_frame = max_frame
+        self.server = None
+        self._executor = executor
+        self._own_executor = executor is None
+        self._keys = KeyCache(cache_size)
+        self._connections = {}  # задача обслуживания соединения -> поток записи
+
+    def _pool(self):
+        """Возвращает пул для крупных запросов, создавая его при первом обращении."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers or os.cpu_count() or 1)
+        return self._executor
+
+    def register(self, key):
+        """Добавляет ключ в кэш сервиса и возвращает его дайджест (32 байта)."""
+        return bytes.fromhex(self._keys.add(key).digest())
+
+    async def process(self, op, data):
+        """
+        Выполняет один запрос.
+
+        Параметры:
+        op (int): Операция.
+        data (bytes): Данные запроса.
+
+        Возвращает:
+        bytes: Данные ответа.
+        """
+        metrics.count('requests')
+        if not OP_KEY <= op <= OP_DECRYPT_MANY:
+            raise ValueError(f"Unknown operation: {op}.")
+        if op == OP_KEY:
+            return bytes.fromhex(self._keys.from_bytes(data).digest())
+        if len(data) < DIGEST_SIZE:
+            raise ValueError("Missing key digest.")
+        digest = data[:DIGEST_SIZE]
+        key = self._keys.get(digest.hex())
+        if key is None:
+            raise UnknownKeyError("Unknown key: send it with OP_KEY first.")
+        if len(data) - DIGEST_SIZE < self.offload_bytes:
+            return execute(cipher_for(key, GridCipher, self.cache_size), op, data[DIGEST_SIZE:])
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), _execute_in_worker, digest, key.to_bytes(), op,
+                                          data[DIGEST_SIZE:])
+
+    async def _respond(self, request_id, op, data, writer, inflight):
+        """Выполняет запрос и записывает ответ; освобождает место в очереди соединения."""
+        try:
+            try:
+                result = await self.process(op, data)
+                status = STATUS_OK
+            except (ValueError, UnicodeError) as error:
+                result = str(error).encode(_ENCODING)
+                status = STATUS_UNKNOWN_KEY if isinstance(error, UnknownKeyError) else STATUS_ERROR
+            except Exception as error:
+                # Сбой пула, нехватка памяти и т.п.: клиент все равно должен получить ответ
+                logger.exception("Request %d failed", request_id)
+                result = f"{type(error).__name__}: {error}".encode(_ENCODING)
+                status = STATUS_ERROR
+            writer.writelines((_LENGTH.pack(_FRAME.size + len(result)), _FRAME.pack(request_id, status), result))
+            await writer.drain()
+        finally:
+            inflight.release()
+
+    async def _serve_connection(self, reader, writer):
+        """Читает кадры соединения и запускает их обработку, не больше max_inflight одновременно."""
+        inflight = asyncio.Semaphore(self.max_inflight)
+        tasks = set()
+        connection = asyncio.current_task()
+        self._connections[connection] = writer
+        try:
+            while True:
+                # Пока все места заняты, кадры не читаются: это и есть обратное давление на клиента
+                await inflight.acquire()
+                try:
+                    (size,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+                except asyncio.IncompleteReadError:
+                    # Клиент закончил отправку (или сервер закрывается): принятые запросы получат ответы
+                    inflight.release()
+                    break
+                if not _FRAME.size <= size <= self.max_frame:
+                    inflight.release()
+                    break
+                frame = await reader.readexactly(size)
+                request_id, op = _FRAME.unpack_from(frame)
+                task = asyncio.create_task(self._respond(request_id, op, frame[_FRAME.size:], writer, inflight))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.pop(connection, None)
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, path=None, host='127.0.0.1', port=0):
+        """
+        Начинает прием соединений.
+
+        Параметры:
+        path (str): Путь Unix-сокета. Если не задан, сервер слушает TCP-порт.
+        host (str): Адрес для TCP (по умолчанию только localhost).
+        port (int): TCP-порт; 0 - любой свободный (см. address).
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._serve_connection, path)
+        else:
+            self.server = await asyncio.start_server(self._serve_connection, host, port)
+        return self.server
+
+    @property
+    def address(self):
+        """Адрес, который слушает сервер: путь Unix-сокета или пара (host, port)."""
+        return self.server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        """Обслуживает соединения до отмены."""
+        await self.server.serve_forever()
+
+    async def close(self):
+        """Останавливает прием соединений и завершает собственный пул процессов."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        # Закрытие сокетов завершает чтение в обработчиках соединений, и они выходят сами
+        connections = list(self._connections.items())
+        for _, writer in connections:
+            writer.close()
+        await asyncio.gather(*(task for task, _ in connections), return_exceptions=True)
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+
+class CipherClient:
+    """
+    Клиент сервиса шифрования. Одно соединение обслуживает любое количество одновременных
+    запросов: они отправляются сразу, а ответы сопоставляются по номеру запроса.
+    """
+    def __init__(self, reader, writer):
+        """
+        Параметры:
+        reader (asyncio.StreamReader): Поток чтения соединения.
+        writer (asyncio.StreamWriter): Поток записи соединения.
+        """
+        self._reader = reader
+        self._writer = writer
+        self._pending = {}
+        self._next_id = 0
+        self._digests = {}  # ключ -> задача регистрации ключа на сервере
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, path=None, host='127.0.0.1', port=None):
+        """Подключается к сервису по Unix-сокету path или к TCP-порту port."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        """Читает ответы и передает их ожидающим запросам."""
+        try:
+            while True:
+                (size,) = _LENGTH.unpack(await self._reader.readexactly(_LENGTH.size))
+                frame = await self._reader.readexactly(size)
+                request_id, status = _FRAME.unpack_from(frame)
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if status == STATUS_OK:
+                    future.set_result(frame[_FRAME.size:])
+                else:
+                    error = UnknownKeyError if status == STATUS_UNKNOWN_KEY else ServiceError
+                    future.set_exception(error(frame[_FRAME.size:].decode(_ENCODING, 'replace')))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection to the cipher service was closed."))
+
+    async def request(self, op, data):
+        """
+        Отправляет запрос и ждет ответа.
+
+        Возвращает:
+        bytes: Данные ответа. При ошибке на стороне сервиса - исключение ServiceError.
+        """
+        if self._receiver.done():
+            raise ConnectionError("Connection to the cipher service was closed.")
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.writelines((_LENGTH.pack(_FRAME.size + len(data)), _FRAME.pack(request_id, op), data))
+            await self._writer.drain()
+        except BaseException:
+            self._pending.pop(request_id, None)
+            if future.done():
+                future.exception()  # ошибку соединения уже записал _receive; отмечаем ее как полученную
+            else:
+                future.cancel()
+            raise
+        return await future
+
+    async def load_key(self, key):
+        """Передает ключ сервису (один раз на соединение) и возвращает его дайджест."""
+        task = self._digests.get(key)
+        if task is None:
+            task = self._digests[key] = asyncio.ensure_future(self.request(OP_KEY, key.to_bytes()))
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            self._digests.pop(key, None)
+            raise
+
+    async def keyed_request(self, key, op, data):
+        """
+        Отправляет запрос с ключом key: перед данными записывается дайджест ключа.
+
+        Если сервис вытеснил ключ из кэша, ключ передается заново и запрос повторяется один раз.
+        """
+        digest = await self.load_key(key)
+        registration = self._digests.get(key)
+        try:
+            return await self.request(op, digest + data)
+        except UnknownKeyError:
+            # Регистрацию сбрасывает только первый из одновременных запросов, остальные ждут новую
+            if self._digests.get(key) is registration:
+                self._digests.pop(key, None)
+            digest = await self.load_key(key)
+            return await self.request(op, digest + data)
+
+    async def encrypt(self, key, text):
+        """Шифрует текст ключом key."""
+        return (await self.keyed_request(key, OP_ENCRYPT, text.encode(_ENCODING))).decode(_ENCODING)
+
+    async def decrypt(self, key, ciphertext, length):
+        """Дешифрует шифртекст ключом key."""
+        data = _TEXT_LENGTH.pack(length) + ciphertext.encode(_ENCODING)
+        return (await self.keyed_request(key, OP_DECRYPT, data)).decode(_ENCODING)
+
+    async def encrypt_many(self, key, messages):
+        """Шифрует список сообщений одним запросом."""
+        return unpack_strings(await self.keyed_request(key, OP_ENCRYPT_MANY, pack_strings(messages)))
+
+    async def decrypt_many(self, key, ciphertexts, lengths):
+        """Дешифрует список шифртекстов одним запросом."""
+        lengths = list(lengths)
+        data = _COUNT.pack(len(lengths)) + struct.pack(f'<{len(lengths)}Q', *lengths)
+        return unpack_strings(await self.keyed_request(key, OP_DECRYPT_MANY, data + pack_strings(ciphertexts)))
+
+    async def close(self):
+        """Закрывает соединение."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await asyncio.gather(self._receiver, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+
+def percentile(values, fraction):
+    """Возвращает перцентиль fraction (0..1) отсортированного списка."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_load(key, path=None, host='127.0.0.1', port=None, connections=8, requests=10000, message_size=32,
+                   pipeline=32, verify=False):
+    """
+    Нагружает сервис короткими запросами шифрования и измеряет задержки.
+
+    Параметры:
+    key (GridKey): Ключ.
+    path, host, port: Адрес сервиса (см. CipherClient.connect).
+    connections (int): Количество соединений.
+    requests (int): Общее количество запросов.
+    message_size (int): Длина сообщения в символах.
+    pipeline (int): Сколько запросов одного соединения отправлять, не дожидаясь ответов.
+    verify (bool): Дешифровать каждый шифртекст и сравнивать с сообщением.
+
+    Возвращает:
+    dict: Количество запросов, ошибок, время, пропускная способность и задержки (мс).
+    """
+    rng = random.Random(0)
+    clients = [await CipherClient.connect(path, host, port) for _ in range(connections)]
+    latencies = []
+    errors = 0
+
+    async def send(client, window, message):
+        nonlocal errors
+        async with window:
+            start = time.perf_counter()
+            try:
+                ciphertext = await client.encrypt(key, message)
+                if verify and await client.decrypt(key, ciphertext, len(message)) != message:
+                    errors += 1
+            except (ServiceError, ConnectionError):
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    async def drive(client, count):
+        window = asyncio.Semaphore(pipeline)
+        await asyncio.gather(*(send(client, window, ''.join(rng.choices('abcdefghijklmnopqrstuvwxyz ', k=message_size)))
+                               for _ in range(count)))
+
+    try:
+        for client in clients:
+            await client.load_key(key)
+        start = time.perf_counter()
+        share, extra = divmod(requests, connections)
+        await asyncio.gather(*(drive(client, share + (index < extra)) for index, client in enumerate(clients)))
+        elapsed = time.perf_counter() - start
+    finally:
+        for client in clients:
+            await client.close()
+
+    latencies.sort()
+    return {
+        'requests': requests, 'errors': errors, 'connections': connections, 'pipeline': pipeline,
+        'seconds': elapsed, 'throughput': requests / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000, 'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+async def _serve(args):
+    """Запускает сервер и обслуживает соединения до прерывания."""
+    server = CipherServer(args.max_inflight, args.offload_bytes, args.workers)
+    await server.start(args.unix, args.host, args.port)
+    print(f"listening on {server.address}", file=sys.stderr)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+async def _load(args):
+    """Запускает нагрузку; без адреса - против сервера в этом же процессе (loopback)."""
+    key = load_key(args.key) if args.key else GridKey.random(8, 8)
+    if args.unix is None and args.port is None:
+        async with CipherServer(args.max_inflight, args.offload_bytes, args.workers) as server:
+            await server.start(host=args.host)
+            _, port = server.address[:2]
+            return await run_load(key, host=args.host, port=port, connections=args.connections,
+                                  requests=args.requests, message_size=args.size, pipeline=args.pipeline,
+                                  verify=args.verify)
+    return await run_load(key, args.unix, args.host, args.port, args.connections, args.requests, args.size,
+                          args.pipeline, args.verify)
+
+
+def build_parser():
+    """Создает разборщик аргументов командной строки."""
+    parser = argparse.ArgumentParser(prog='python -m reshetka.service',
+                                     description="Local asyncio grid cipher service and load generator.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help="run the service")
+    load = commands.add_parser('load', help="run a load test (against an in-process server without an address)")
+    for sub in (serve, load):
+        sub.add_argument('--unix', metavar='PATH', help="Unix socket path")
+        sub.add_argument('--host', default='127.0.0.1')
+        sub.add_argument('--port', type=int, help="TCP port")
+        sub.add_argument('--max-inflight', type=int, default=DEFAULT_MAX_INFLIGHT,
+                         help="requests processed at once per connection")
+        sub.add_argument('--offload-bytes', type=int, default=DEFAULT_OFFLOAD_BYTES,
+                         help="requests at least this large run in the process pool")
+        sub.add_argument('--workers', type=int, help="process pool size (default: CPU count)")
+    serve.set_defaults(port=0)
+    load.add_argument('--key', help="key file (default: random 8x8 key)")
+    load.add_argument('--connections', type=int, default=8)
+    load.add_argument('--requests', type=int, default=10000)
+    load.add_argument('--size', type=int, default=32, help="message length in characters")
+    load.add_argument('--pipeline', type=int, default=32, help="requests in flight per connection")
+    load.add_argument('--verify', action='store_true', help="decrypt and check every ciphertext")
+    return parser
+
+
+def main(argv=None):
+    """Точка входа командной строки. Возвращает код завершения."""
+    args = build_parser().parse_args(argv)
+    if args.command == 'serve':
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    try:
+        result = asyncio.run(_load(args))
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 1 if result['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+Потоковое шифрование и дешифрование с ограниченным расходом памяти.
+
+Формат потока шифртекста:
+
+    RGC1 <rows> <cols>\\n          - заголовок с размерами решетки
+    <блок><блок>...<блок>         - блоки по rows * cols символов
+    =<длина открытого текста>\\n   - завершающая запись фиксированной длины
+
+Все блоки, кроме последнего, заполнены полностью, поэтому длины открытого текста
+достаточно, чтобы отбросить случайные символы последнего блока. Длина известна только
+после чтения всего входа, поэтому она записывается в конце потока.
+"""
+STREAM_MAGIC = 'RGC1'
+TRAILER_LENGTH = 22  # '=' + 20 цифр + '\n'
+DEFAULT_CHUNK_BLOCKS = 256
+
+
+class _IterableReader:
+    """Обертка над итератором строк с методом read(size), как у текстового файла."""
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        # Текущая строка итератора и смещение в ней: непрочитанный остаток не копируется,
+        # поэтому чтение большой строки по частям остается линейным
+        self.buffer = ''
+        self.offset = 0
+
+    def read(self, size):
+        end = self.offset + size
+        if end <= len(self.buffer):
+            self.offset = end
+            return self.buffer[end - size:end]
+        parts = [self.buffer[self.offset:]]
+        available = len(parts[0])
+        self.buffer, self.offset = '', 0
+        for chunk in self.chunks:
+            if available + len(chunk) >= size:
+                self.buffer, self.offset = chunk, size - available
+                parts.append(chunk[:self.offset])
+                break
+            parts.append(chunk)
+            available += len(chunk)
+        return ''.join(parts)
+
+
+def _as_reader(source):
+    """Возвращает объект с методом read(size) для файла или итератора строк."""
+    if hasattr(source, 'read'):
+        return source
+    if isinstance(source, str):
+        return _IterableReader([source])
+    return _IterableReader(source)
+
+
+def _read_exact(reader, size):
+    """Читает ровно size символов или меньше, если поток закончился."""
+    data = reader.read(size)
+    if len(data) == size or not data:
+        return data
+    parts = [data]
+    remaining = size - len(data)
+    while remaining:
+        data = reader.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return ''.join(parts)
+
+
+def format_header(key):
+    """Возвращает строку заголовка потока для ключа."""
+    return f"{STREAM_MAGIC} {key.rows} {key.cols}\n"
+
+
+def parse_header(line, key):
+    """
+    Проверяет заголовок потока и его соответствие ключу.
+
+    Параметры:
+    line (str): Первая строка потока.
+    key (GridKey): Ключ, которым будет выполняться дешифрование.
+    """
+    parts = line.split()
+    if len(parts) != 3 or parts[0] != STREAM_MAGIC:
+        raise ValueError("Not a grid cipher stream: bad header.")
+    rows, cols = int(parts[1]), int(parts[2])
+    if (rows, cols) != (key.rows, key.cols):
+        raise ValueError(f"Stream was encrypted with a {rows}x{cols} grid, "
+                         f"but the key is {key.rows}x{key.cols}.")
+
+
+def format_trailer(length):
+    """Возвращает завершающую запись с длиной открытого текста."""
+    return f"={length:020d}\n"
+
+
+def parse_trailer(trailer):
+    """Возвращает длину открытого текста из завершающей записи потока."""
+    if len(trailer) != TRAILER_LENGTH or trailer[0] != '=' or trailer[-1] != '\n' or not trailer[1:-1].isdigit():
+        raise ValueError("Grid cipher stream is truncated or corrupted.")
+    return int(trailer[1:-1])
+
+
+def encrypt_iter(cipher, source, chunk_blocks=DEFAULT_CHUNK_BLOCKS):
+    """
+    Шифрует поток текста по частям и по мере готовности возвращает части шифртекста.
+
+    Параметры:
+    cipher (GridCipher): Шифратор.
+    source: Текстовый файл (объект с методом read) или итератор строк.
+    chunk_blocks (int): Сколько блоков шифровать за один раз.
+
+    Возвращает:
+    generator: Строки заголовка, блоков шифртекста и завершающей записи.
+    """
+    if not cipher.write_order:
+        raise ValueError("The grid is empty. No holes selected!")
+
+    reader = _as_reader(source)
+    chunk_size = cipher.max_length * chunk_blocks
+    alphabet = None
+    length = 0
+
+    yield format_header(cipher.key)
+    while True:
+        chunk = _read_exact(reader, chunk_size)
+        if not chunk:
+            break
+        if alphabet is None:
+            # Алфавит заполнения выбирается по первой части и дальше не меняется
+            alphabet = cipher.resolve_alphabet(chunk)
+        length += len(chunk)
+        yield cipher.encrypt(chunk, alphabet)
+        if len(chunk) < chunk_size:
+            break
+    yield format_trailer(length)
+
+
+def decrypt_iter(cipher, source, chunk_blocks=DEFAULT_CHUNK_BLOCKS):
+    """
+    Дешифрует поток шифртекста по частям и по мере готовности возвращает открытый текст.
+
+    Параметры:
+    cipher (GridCipher): Шифратор с тем же ключом, что и при шифровании.
+    source: Текстовый файл (объект с методом read) или итератор строк.
+    chunk_blocks (int): Сколько блоков дешифровать за один раз.
+
+    Возвращает:
+    generator: Части открытого текста.
+    """
+    if not cipher.write_order:
+        raise ValueError("The grid is empty. No holes selected!")
+
+    reader = _as_reader(source)
+    block_size = cipher.block_size
+    header = []
+    while not header or header[-1] != '\n':
+        char = reader.read(1)
+        if not char:
+            raise ValueError("Not a grid cipher stream: bad header.")
+        header.append(char)
+    parse_header(''.join(header), cipher.key)
+
+    # Последний блок и завершающую запись придерживаем, пока не дочитаем поток:
+    # только после этого известно, сколько символов последнего блока - заполнение.
+    reserve = block_size + TRAILER_LENGTH
+    buffer = ''
+    emitted = 0
+    while True:
+        chunk = _read_exact(reader, block_size * chunk_blocks)
+        buffer += chunk
+        ready = (len(buffer) - reserve) // block_size * block_size
+        if ready > 0:
+            text = cipher.decrypt(buffer[:ready], ready // block_size * cipher.max_length)
+            emitted += len(text)
+            buffer = buffer[ready:]
+            yield text
+        if not chunk:
+            break
+
+    length = parse_trailer(buffer[-TRAILER_LENGTH:])
+    body = buffer[:-TRAILER_LENGTH]
+    if len(body) % block_size or length < emitted or length - emitted > len(body) // block_size * cipher.max_length:
+        raise ValueError("Grid cipher stream is truncated or corrupted.")
+    if length > emitted:
+        yield cipher.decrypt(body, length - emitted)
+
+
+def encrypt_stream(cipher, reader, writer, chunk_blocks=DEFAULT_CHUNK_BLOCKS):
+    """
+    Шифрует текст из reader и записывает поток шифртекста в writer.
+
+    Параметры:
+    cipher (GridCipher): Шифратор.
+    reader: Текстовый файл или итератор строк с открытым текстом.
+    writer: Текстовый файл (объект с методом write).
+    chunk_blocks (int): Сколько блоков шифровать за один раз.
+
+    Возвращает:
+    int: Количество записанных символов шифртекста.
+    """
+    written = 0
+    for part in encrypt_iter(cipher, reader, chunk_blocks):
+        writer.write(part)
+        written += len(part)
+    return written
+
+
+def decrypt_stream(cipher, reader, writer, chunk_blocks=DEFAULT_CHUNK_BLOCKS):
+    """
+    Дешифрует поток шифртекста из reader и записывает открытый текст в writer.
+
+    Параметры:
+    cipher (GridCipher): Шифратор с тем же ключом, что и при шифровании.
+    reader: Текстовый файл или итератор строк с потоком шифртекста.
+    writer: Текстовый файл (объект с методом write).
+    chunk_blocks (int): Сколько блоков дешифровать за один раз.
+
+    Возвращает:
+    int: Длина открытого текста.
+    """
+    written = 0
+    for part in decrypt_iter(cipher, reader, chunk_blocks):
+        writer.write(part)
+        written += len(part)
+    return written
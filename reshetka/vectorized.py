@@ -0,0 +1,199 @@
+"""
+Векторизованный вариант шифра на NumPy. NumPy - необязательная зависимость:
+модуль импортируется и без нее, но создать VectorizedGridCipher и VectorizedByteGridCipher
+тогда нельзя.
+"""
+from . import metrics
+from .binary import ByteGridCipher
+from .engine import GridCipher
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+HAS_NUMPY = np is not None
+
+_ENCODING = 'utf-32-le'
+
+
+def _to_codes(text):
+    """Преобразует строку в массив кодов символов (uint32) без копирования по символам."""
+    return np.frombuffer(text.encode(_ENCODING, 'surrogatepass'), dtype=np.uint32)
+
+
+def _from_codes(codes):
+    """Преобразует массив кодов символов обратно в строку."""
+    return np.ascontiguousarray(codes, dtype=np.uint32).tobytes().decode(_ENCODING, 'surrogatepass')
+
+
+class VectorizedGridCipher(GridCipher):
+    """
+    Шифр поворачивающейся решетки, обрабатывающий все блоки сообщения одной операцией.
+
+    Текст превращается в массив кодов символов формы (число блоков x max_length),
+    а порядок записи ключа используется как индекс NumPy: одна запись по индексу
+    шифрует все блоки сразу, одна выборка - расшифровывает.
+    """
+    def __init__(self, key, alphabet=None, rng=None):
+        """
+        Параметры:
+        key (GridKey): Ключ - размеры решетки и набор дырок.
+        alphabet (list): Алфавит для случайных символов. Если не задан, выбирается по тексту.
+        rng (random.Random): Генератор случайных байтов для заполнения. По умолчанию - os.urandom.
+        """
+        if np is None:
+            raise ImportError("VectorizedGridCipher requires numpy")
+        super().__init__(key, alphabet, rng)
+        self._order = np.asarray(self.write_order, dtype=np.intp)
+
+    def padding(self, alphabet, shape):
+        """
+        Возвращает массив случайных символов алфавита заданной формы.
+
+        Параметры:
+        alphabet (list): Алфавит для случайных символов.
+        shape (tuple): Форма результата.
+        """
+        # Копия нужна, потому что в массив заполнения затем записываются символы текста
+        return _to_codes(self.padding_source(alphabet).take(int(np.prod(shape)))).reshape(shape).copy()
+
+    def encrypt(self, text, alphabet=None):
+        """
+        Шифрует текст целиком, все блоки за одну операцию.
+
+        Параметры:
+        text (str): Открытый текст.
+        alphabet (list): Алфавит для случайных символов. По умолчанию - алфавит шифратора
+            или определенный по тексту.
+
+        Возвращает:
+        str: Шифртекст длиной, кратной rows * cols.
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        if not text:
+            return ''
+
+        if alphabet is None:
+            alphabet = self.resolve_alphabet(text)
+        codes = _to_codes(text)
+        full_blocks, rest = divmod(len(codes), self.max_length)
+        block_count = full_blocks + (1 if rest else 0)
+
+        blocks = self.padding(alphabet, (block_count, self.block_size))
+        with metrics.stage('permutation'):
+            blocks[:full_blocks, self._order] = codes[:full_blocks * self.max_length].reshape(full_blocks,
+                                                                                              self.max_length)
+            if rest:
+                blocks[full_blocks, self._order[:rest]] = codes[full_blocks * self.max_length:]
+
+        with metrics.stage('assembly'):
+            ciphertext = _from_codes(blocks)
+        metrics.count('blocks', block_count)
+        metrics.count('characters', len(text))
+        return ciphertext
+
+    def decrypt(self, ciphertext, length):
+        """
+        Дешифрует шифртекст, все полные блоки за одну операцию.
+
+        Параметры:
+        ciphertext (str): Шифртекст.
+        length (int): Длина исходного сообщения.
+
+        Возвращает:
+        str: Открытый текст длиной не более length.
+        """
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        if length <= 0:
+            return ''
+
+        needed_blocks = -(-length // self.max_length)
+        ciphertext = ciphertext[:needed_blocks * self.block_size]
+        full_blocks = len(ciphertext) // self.block_size
+        codes = _to_codes(ciphertext[:full_blocks * self.block_size])
+
+        with metrics.stage('permutation'):
+            plain = codes.reshape(full_blocks, self.block_size)[:, self._order]
+        with metrics.stage('assembly'):
+            decrypted = _from_codes(plain)
+            tail = ciphertext[full_blocks * self.block_size:]
+            if tail:
+                decrypted += self.decrypt_block(tail, length - len(decrypted))
+            decrypted = decrypted[:length]
+        metrics.count('blocks', full_blocks + (1 if tail else 0))
+        metrics.count('characters', len(decrypted))
+        return decrypted
+
+
+class VectorizedByteGridCipher(ByteGridCipher):
+    """
+    Байтовый шифр на NumPy: входной буфер читается через np.frombuffer без копирования,
+    а все блоки переставляются одной записью по индексу прямо в выходной буфер.
+    """
+    def __init__(self, key, alphabet=None, rng=None):
+        """
+        Параметры:
+        key (GridKey): Ключ - размеры решетки и набор дырок.
+        alphabet (bytes | Alphabet): Байты для заполнения. По умолчанию - все 256 значений.
+        rng (random.Random): Генератор случайных байтов для заполнения. По умолчанию - os.urandom.
+        """
+        if np is None:
+            raise ImportError("VectorizedByteGridCipher requires numpy")
+        super().__init__(key, alphabet, rng)
+        self._order = np.asarray(self.write_order, dtype=np.intp)
+        self._free = np.asarray(key.free_cells, dtype=np.intp)
+
+    def padding_array(self, alphabet, shape):
+        """Возвращает массив случайных байтов алфавита заданной формы."""
+        return np.frombuffer(self.padding_bytes(int(np.prod(shape)), alphabet), dtype=np.uint8).reshape(shape)
+
+    def encrypt_into(self, data, out, alphabet=None):
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        source = np.frombuffer(data, dtype=np.uint8)
+        length = len(source)
+        size = self.encrypted_size(length)
+        target = np.frombuffer(out, dtype=np.uint8)
+        if len(target) < size:
+            raise ValueError(f"Output buffer too small: need {size} bytes, got {len(target)}.")
+        if not size:
+            return 0
+
+        full_blocks, rest = divmod(length, self.max_length)
+        blocks = target[:size].reshape(-1, self.block_size)
+        blocks[:, self._free] = self.padding_array(alphabet, (len(blocks), len(self._free)))
+        with metrics.stage('permutation'):
+            blocks[:full_blocks, self._order] = source[:full_blocks * self.max_length].reshape(full_blocks,
+                                                                                               self.max_length)
+            if rest:
+                blocks[full_blocks, self._order[:rest]] = source[full_blocks * self.max_length:]
+                blocks[full_blocks, self._order[rest:]] = self.padding_array(alphabet, self.max_length - rest)
+        metrics.count('blocks', len(blocks))
+        metrics.count('bytes', length)
+        return size
+
+    def decrypt_into(self, data, length, out):
+        if not self.write_order:
+            raise ValueError("The grid is empty. No holes selected!")
+        source = np.frombuffer(data, dtype=np.uint8)
+        target = np.frombuffer(out, dtype=np.uint8)
+        if len(target) < length:
+            raise ValueError(f"Output buffer too small: need {length} bytes, got {len(target)}.")
+
+        full_blocks = min(length // self.max_length, len(source) // self.block_size)
+        written = full_blocks * self.max_length
+        with metrics.stage('permutation'):
+            np.take(source[:full_blocks * self.block_size].reshape(full_blocks, self.block_size), self._order,
+                    axis=1, out=target[:written].reshape(full_blocks, self.max_length))
+            tail = source[full_blocks * self.block_size:(full_blocks + 1) * self.block_size]
+            if written < length and len(tail):
+                plain = self.decrypt_block(tail, length - written)
+                target[written:written + len(plain)] = np.frombuffer(plain, dtype=np.uint8)
+                written += len(plain)
+                full_blocks += 1
+        metrics.count('blocks', full_blocks)
+        metrics.count('bytes', written)
+        return written
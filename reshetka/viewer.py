@@ -0,0 +1,144 @@
+"""
+Виртуализированный просмотр зашифрованных решеток на одном холсте.
+"""
+import tkinter as tk
+
+
+class EncryptedGridViewer:
+    """
+    Прокручиваемый список зашифрованных решеток.
+
+    Рисуются только решетки, попадающие в видимую область холста. Элементы холста
+    (прямоугольники и надписи одной решетки) не удаляются при прокрутке, а переносятся
+    к новой решетке и получают ее символы, поэтому число элементов на холсте не зависит
+    от длины сообщения.
+    """
+    def __init__(self, parent, width, height, margin=20):
+        """
+        Параметры:
+        parent (tk.Widget): Родительский виджет.
+        width (int): Ширина холста.
+        height (int): Высота холста.
+        margin (int): Отступ вокруг каждой решетки.
+        """
+        self.margin = margin
+        self.scrollbar = tk.Scrollbar(parent, orient=tk.VERTICAL, command=self.yview)
+        self.canvas = tk.Canvas(parent, width=width, height=height, yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", lambda event: self.refresh())
+        self.canvas.bind("<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self.yview(tk.SCROLL, -1, tk.UNITS))
+        self.canvas.bind("<Button-5>", lambda event: self.yview(tk.SCROLL, 1, tk.UNITS))
+
+        self.blocks = []
+        self.grid_rows = 0
+        self.grid_cols = 0
+        self.cell_size = 0
+        self.visible = {}  # номер решетки -> набор элементов холста, которым она нарисована
+        self.pool = []  # свободные наборы элементов
+        self.slot_count = 0
+
+    @property
+    def pitch(self):
+        """Расстояние по вертикали между началами соседних решеток."""
+        return self.grid_rows * self.cell_size + 2 * self.margin
+
+    def show(self, blocks, grid_rows, grid_cols, cell_size):
+        """
+        Отображает новый набор зашифрованных решеток.
+
+        Параметры:
+        blocks (list): Блоки шифртекста, по rows * cols символов.
+        grid_rows (int): Количество строк решетки.
+        grid_cols (int): Количество столбцов решетки.
+        cell_size (int): Размер ячейки в пикселях.
+        """
+        if (grid_rows, grid_cols, cell_size) != (self.grid_rows, self.grid_cols, self.cell_size):
+            # Наборы элементов другого размера использовать нельзя
+            self.canvas.delete("all")
+            self.pool = []
+            self.slot_count = 0
+        else:
+            # Решетки прошлого сообщения прячутся: иначе незанятые наборы так и остались бы на холсте
+            for slot in self.visible.values():
+                self.canvas.itemconfigure(slot['tag'], state=tk.HIDDEN)
+                self.pool.append(slot)
+        self.visible = {}
+        self.grid_rows, self.grid_cols, self.cell_size = grid_rows, grid_cols, cell_size
+        self.blocks = []
+        self.canvas.yview_moveto(0)
+        self.append(blocks)
+
+    def append(self, blocks):
+        """Добавляет решетки в конец списка (например, по мере шифрования)."""
+        self.blocks.extend(blocks)
+        width = self.grid_cols * self.cell_size + 2 * self.margin
+        self.canvas.config(scrollregion=(0, 0, width, max(1, len(self.blocks) * self.pitch)),
+                           yscrollincrement=max(1, self.cell_size))
+        self.refresh()
+
+    def clear(self):
+        """Убирает все решетки."""
+        self.show([], self.grid_rows, self.grid_cols, self.cell_size)
+
+    def yview(self, *args):
+        """Прокручивает холст и перерисовывает видимые решетки (команда полосы прокрутки)."""
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def on_mousewheel(self, event):
+        """Прокрутка колесом мыши (Windows и macOS)."""
+        self.yview(tk.SCROLL, -1 if event.delta > 0 else 1, tk.UNITS)
+
+    def visible_range(self):
+        """Возвращает номера первой и последней (не включительно) решеток в видимой области."""
+        if not self.blocks:
+            return 0, 0
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(max(self.canvas.winfo_height(), 1))
+        first = max(0, int(top // self.pitch))
+        last = min(len(self.blocks), int(bottom // self.pitch) + 1)
+        return first, last
+
+    def refresh(self):
+        """Рисует решетки видимой области, освобождая элементы ушедших из нее."""
+        first, last = self.visible_range()
+        for index in [index for index in self.visible if not first <= index < last]:
+            slot = self.visible.pop(index)
+            self.canvas.itemconfigure(slot['tag'], state=tk.HIDDEN)
+            self.pool.append(slot)
+        for index in range(first, last):
+            if index not in self.visible:
+                self.visible[index] = self.draw(index)
+
+    def new_slot(self):
+        """Создает набор элементов холста для одной решетки."""
+        tag = f"slot{self.slot_count}"
+        self.slot_count += 1
+        texts = []
+        for i in range(self.grid_rows):
+            for j in range(self.grid_cols):
+                x1 = self.margin + j * self.cell_size
+                y1 = i * self.cell_size
+                x2 = x1 + self.cell_size
+                y2 = y1 + self.cell_size
+                self.canvas.create_rectangle(x1, y1, x2, y2, fill="lightgreen", tags=(tag,))
+                texts.append(self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, fill="black", tags=(tag,)))
+        return {'tag': tag, 'y': 0, 'texts': texts}
+
+    def draw(self, index):
+        """Рисует решетку с номером index, используя свободный набор элементов."""
+        slot = self.pool.pop() if self.pool else self.new_slot()
+        y = index * self.pitch + self.margin
+        self.canvas.move(slot['tag'], 0, y - slot['y'])
+        slot['y'] = y
+
+        block = self.blocks[index]
+        for text_id, char in zip(slot['texts'], block):
+            self.canvas.itemconfigure(text_id, text=char)
+        for text_id in slot['texts'][len(block):]:
+            self.canvas.itemconfigure(text_id, text="")
+        self.canvas.itemconfigure(slot['tag'], state=tk.NORMAL)
+        return slot